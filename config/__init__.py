@@ -14,4 +14,9 @@ Version  Date        Author             Description
 
 """
 
-from .config import Config
+from .config import Config, clear_file_cache, clear_fingerprint_cache
+from ._utils import clear_import_cache
+from ._backends import register_loader, register_writer
+from ._parallel import InstantiationError
+from ._paths import KeyPath, compile_path
+from ._schema import ValidationError, compile_schema
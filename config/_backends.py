@@ -0,0 +1,358 @@
+"""_backends.py: Registry of the file format backends used by the config tool.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Registry of the load and write functions for the supported config file formats.
+For every file extension the first installed backend of a list of candidates
+is used, e.g. 'orjson' or 'ujson' before the standard 'json' module and the
+libyaml based 'CSafeLoader' before the pure Python 'SafeLoader'. Users can
+register their own load and write functions per extension.
+
+A loader takes the content of a file as string and returns the parsed data.
+A writer takes the data, a text file object and the keyword arguments
+'indent' and 'sort_keys'. Builtin writers also take 'default', a function
+replacing objects the format does not support, and write to the file while
+serializing, e.g. batches of toplevel values, instead of building the whole
+text first. Backends can provide a stream loader, taking a binary file object,
+which parses large files without reading the whole text into memory, e.g.
+from a memory-mapped buffer.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+# pylint: disable=import-outside-toplevel
+
+import re
+import math
+import logging
+import functools
+from collections import namedtuple
+
+
+__all__ = ['Backend', 'get_backend', 'get_file_loader', 'get_file_stream_loader', 'get_file_writer',
+           'register_loader', 'register_writer', 'to_serializable']
+LOG = logging.getLogger('Config')
+
+Backend = namedtuple('Backend', ['name', 'loader', 'writer', 'stream_loader'])
+
+_NATIVE_TYPES = (str, int, float, bool, type(None))
+# Number of toplevel values serialized at once by streaming writers
+_WRITE_BATCH_SIZE = 1000
+# orjson supports integers of 64 bits only and parses wider integers as floats. Numbers
+# with 19 digits or more, e.g. below -2 ** 63, are parsed by 'json' instead.
+_LONG_NUMBER = re.compile(r'\d{19}')
+_LONG_NUMBER_BYTES = re.compile(rb'\d{19}')
+_ORJSON_INTS = range(-2 ** 63, 2 ** 64)
+
+
+def to_serializable(data, default):
+    """Returns 'data' with tuples replaced by lists and all other objects, which are
+    not supported by every file format, replaced by 'default(obj)'. Containers are
+    only copied if they contain such objects."""
+    if isinstance(data, _NATIVE_TYPES):
+        return data
+
+    if isinstance(data, dict):
+        result = data
+        for key, value in data.items():
+            new_value = to_serializable(value, default)
+            if new_value is not value:
+                result = dict(data) if result is data else result
+                result[key] = new_value
+        return result
+
+    if isinstance(data, (list, tuple)):
+        result = data if isinstance(data, list) else list(data)
+        for i, value in enumerate(data):
+            new_value = to_serializable(value, default)
+            if new_value is not value:
+                result = list(data) if result is data else result
+                result[i] = new_value
+        return result
+
+    return default(data)
+
+
+def _is_orjson_safe(data):
+    """Returns if orjson writes all numbers of 'data' unchanged; it writes NaN and
+    infinite floats as null and does not support integers wider than 64 bits."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, float):
+            if not math.isfinite(value):
+                return False
+        elif isinstance(value, int) and value not in _ORJSON_INTS:
+            return False
+    return True
+
+
+def _orjson():
+    import json
+    import orjson  # pylint: disable=import-error
+
+    def loader(text):
+        if _LONG_NUMBER.search(text) is not None:
+            return json.loads(text)
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # orjson is strict about e.g. NaN, fall back to 'json'
+            return json.loads(text)
+
+    def sort_key(key):
+        # the order of 'OPT_SORT_KEYS', which sorts non-string keys by their JSON text, e.g. 'true'
+        return key if isinstance(key, str) else orjson.dumps(key).decode()
+
+    def writer(data, file, indent=2, sort_keys=True, default=None):
+        if indent and indent != 2 or not _is_orjson_safe(data):
+            # orjson only indents by two spaces and changes some numbers
+            json.dump(data, file, indent=indent, sort_keys=sort_keys, default=default)
+            return
+
+        # non-string keys, e.g. integer keys of YAML files, are written as strings like 'json' does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if not isinstance(data, dict) or len(data) <= _WRITE_BATCH_SIZE:
+            file.write(orjson.dumps(data, default=default, option=option).decode())
+            return
+
+        # Write batches of toplevel values, so only the text of one batch is held in memory
+        keys = sorted(data, key=sort_key) if sort_keys else list(data)
+        file.write('{')
+        for start in range(0, len(keys), _WRITE_BATCH_SIZE):
+            batch = {key: data[key] for key in keys[start:start + _WRITE_BATCH_SIZE]}
+            text = orjson.dumps(batch, default=default, option=option).decode()
+            # strip the braces, and with indent the line break before the closing brace
+            file.write((',' if start else '') + text[1:-2 if indent else -1])
+        file.write('\n}' if indent else '}')
+
+    def stream_loader(file):
+        import mmap
+
+        # orjson parses the memory-mapped file without a copy of its content
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer, memoryview(buffer) as view:
+            if _LONG_NUMBER_BYTES.search(view) is not None:
+                return json.loads(bytes(view))
+            try:
+                return orjson.loads(view)
+            except orjson.JSONDecodeError:
+                return json.loads(bytes(view))
+
+    return Backend('orjson', loader, writer, stream_loader)
+
+
+def _ujson():
+    import ujson  # pylint: disable=import-error
+
+    def writer(data, file, indent=2, sort_keys=True, default=None):
+        if default is not None:
+            data = to_serializable(data, default)
+        ujson.dump(data, file, indent=indent or 0, sort_keys=sort_keys)
+
+    return Backend('ujson', ujson.loads, writer, None)
+
+
+def _json():
+    import json
+
+    def writer(data, file, indent=2, sort_keys=True, default=None):
+        # 'json.dump' writes the chunks of the encoder to the file
+        json.dump(data, file, indent=indent, sort_keys=sort_keys, default=default)
+
+    try:
+        import ijson
+
+        def stream_loader(file):
+            return next(ijson.items(file, '', use_float=True))
+    except ImportError:
+        stream_loader = None
+
+    return Backend('json', json.loads, writer, stream_loader)
+
+
+def _json5():
+    import json5  # pylint: disable=import-error
+
+    def writer(data, file, indent=2, sort_keys=True, default=None):
+        if default is not None:
+            data = to_serializable(data, default)
+        json5.dump(data, file, indent=indent, sort_keys=sort_keys)
+
+    return Backend('json5', json5.loads, writer, None)
+
+
+def _xmltodict():
+    import xmltodict  # pylint: disable=import-error
+
+    def writer(data, file, indent=2, sort_keys=True, default=None):
+        # pylint: disable=unused-argument
+        if default is not None:
+            data = to_serializable(data, default)
+        xmltodict.unparse(data, output=file, pretty=bool(indent))
+
+    return Backend('xmltodict', xmltodict.parse, writer, xmltodict.parse)
+
+
+def _cyaml():
+    import yaml  # pylint: disable=import-error
+    from yaml import CSafeLoader, CSafeDumper  # pylint: disable=import-error
+
+    return _yaml_backend('cyaml', yaml, CSafeLoader, CSafeDumper)
+
+
+def _yaml():
+    import yaml  # pylint: disable=import-error
+
+    return _yaml_backend('yaml', yaml, yaml.SafeLoader, yaml.SafeDumper)
+
+
+def _yaml_backend(name, yaml, loader_cls, dumper_cls):
+    def loader(text):
+        return yaml.load(text, Loader=loader_cls)
+
+    def writer(data, file, indent=2, sort_keys=True, default=None):
+        if default is not None:
+            data = to_serializable(data, default)
+        # the emitter writes to the file while serializing
+        yaml.dump(data, file, Dumper=dumper_cls, indent=indent, sort_keys=sort_keys, default_flow_style=False)
+
+    def stream_loader(file):
+        # the yaml reader consumes the file in chunks
+        return yaml.load(file, Loader=loader_cls)
+
+    return Backend(name, loader, writer, stream_loader)
+
+
+# Candidate backends per extension, ordered by preference.
+_CANDIDATES = {
+    '.json': (('orjson', _orjson), ('ujson', _ujson), ('json', _json)),
+    '.json5': (('json5', _json5), ),
+    '.xml': (('xmltodict', _xmltodict), ),
+    '.yml': (('cyaml', _cyaml), ('yaml', _yaml)),
+    '.yaml': (('cyaml', _cyaml), ('yaml', _yaml)),
+}
+
+_RESOLVED = {}
+_LOADERS = {}
+_WRITERS = {}
+
+
+def _normalize(ext):
+    ext = ext.lower()
+    return ext if ext.startswith('.') else '.' + ext
+
+
+def get_backend(ext, name=None):
+    """Returns the backend for a file extension.
+
+    :param ext: File extension, e.g. '.json'
+    :param name: optional;
+        Name of a builtin backend, e.g. 'json'. If not passed the first
+        installed backend is returned.
+    """
+    ext = _normalize(ext)
+    if name is None and ext in _RESOLVED:
+        return _RESOLVED[ext]
+
+    if ext not in _CANDIDATES:
+        ex = ValueError(f"Unknown configuration filetype {ext}!")
+        LOG.exception(ex)
+        raise ex
+
+    for candidate, factory in _CANDIDATES[ext]:
+        if name is not None and candidate != name:
+            continue
+        try:
+            backend = factory()
+        except ImportError:
+            LOG.debug('Backend %s for %s is not available.', candidate, ext)
+            continue
+
+        if name is None:
+            _RESOLVED[ext] = backend
+        return backend
+
+    if name is not None:
+        raise ImportError(f"Backend {name} for {ext} is not available")
+
+    names = ', '.join(candidate for candidate, _ in _CANDIDATES[ext])
+    ex = ImportError(f"No backend for {ext} available, install one of: {names}")
+    LOG.exception(ex)
+    raise ex
+
+
+def get_file_loader(ext):
+    """Returns a load function for a given file extension."""
+    ext = _normalize(ext)
+    if ext in _LOADERS:
+        return _LOADERS[ext]
+    return get_backend(ext).loader
+
+
+def get_file_stream_loader(ext):
+    """Returns a load function reading a binary file object for a given file
+    extension or None if the backend does not support streaming."""
+    ext = _normalize(ext)
+    if ext in _LOADERS:
+        return None
+    return get_backend(ext).stream_loader
+
+
+def get_file_writer(ext, default=None):
+    """Returns a write function for a given file extension.
+
+    :param ext: File extension, e.g. '.json'
+    :param default: optional;
+        Function returning a serializable replacement of an object the file format
+        does not support, e.g. the name of an imported class. It should raise a
+        TypeError if the object can not be written.
+    """
+    ext = _normalize(ext)
+    if ext in _WRITERS:
+        writer = _WRITERS[ext]
+        if default is None:
+            return writer
+        return lambda data, file, **kwargs: writer(to_serializable(data, default), file, **kwargs)
+
+    writer = get_backend(ext).writer
+    return writer if default is None else functools.partial(writer, default=default)
+
+
+def register_loader(ext, loader):
+    """Registers a load function for a file extension.
+
+    :param ext: File extension, e.g. '.toml'
+    :param loader: Function parsing the file content (str), None restores the default
+    """
+    ext = _normalize(ext)
+    if loader is None:
+        _LOADERS.pop(ext, None)
+    else:
+        _LOADERS[ext] = loader
+
+
+def register_writer(ext, writer):
+    """Registers a write function for a file extension.
+
+    :param ext: File extension, e.g. '.toml'
+    :param writer: Function called with the data, a text file object and the keyword
+                    arguments 'indent' and 'sort_keys', None restores the default
+    """
+    ext = _normalize(ext)
+    if writer is None:
+        _WRITERS.pop(ext, None)
+    else:
+        _WRITERS[ext] = writer
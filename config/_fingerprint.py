@@ -0,0 +1,159 @@
+"""_fingerprint.py: Content hashes of config values.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Computes a stable SHA-256 hash of a config value, e.g. to key cached datasets
+or checkpoints on the config. The hash depends on the content only, not on
+the order of dictionary keys, the file format or whether a list is a tuple.
+Imported objects and the classes of configured objects are hashed by their
+dotted name.
+
+The hash of every dictionary and list is cached by its identity in a cache
+of the config. Config values are never modified in place, overrides copy the
+containers along the overridden paths, so only the hashes of overridden
+subtrees are computed again.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+# pylint: disable=import-outside-toplevel
+
+from .constants import CLASS_TAG
+
+
+__all__ = ['fingerprint']
+
+_CONTAINERS = (dict, list, tuple)
+_STR_TYPES = frozenset([str])
+
+
+def fingerprint(value, name_of, cache, previous=(), memoize=True):
+    """Returns the hex SHA-256 hash of a config value.
+
+    :param value: Config value, e.g. a dictionary of toplevel values
+    :param name_of: Function returning the dotted name of an object, e.g. an
+                    imported class, or None if the object can not be hashed
+    :param cache: Dictionary mapping the ids of hashed containers to the container,
+                  its hash and its nested containers; the cache keeps the containers
+                  alive, so their ids are not reused
+    :param previous: Caches to look up hashes missing in 'cache'; found hashes
+                     are added to 'cache', so 'cache' only holds the containers
+                     of 'value'
+    :param memoize: If False, the hash of 'value' itself is not cached, e.g.
+                    if it is modified in place; nested containers are cached
+    :raises TypeError: If a value is neither a builtin value nor named by 'name_of'
+    """
+    import hashlib
+
+    hasher = _Hasher(name_of, cache, previous, hashlib.sha256)
+    if isinstance(value, _CONTAINERS):
+        digest = hasher.digest(value) if memoize else hasher.hash_container(value)[0]
+    else:
+        digest = hashlib.sha256(_encode(value, name_of)).digest()
+    return digest.hex()
+
+
+class _Hasher:
+    __slots__ = ('name_of', 'cache', 'previous', 'sha256')
+
+    def __init__(self, name_of, cache, previous, sha256):
+        self.name_of = name_of
+        self.cache = cache
+        # only caches with hashes are searched
+        self.previous = [hashes for hashes in previous if hashes]
+        self.sha256 = sha256
+
+    def digest(self, value):
+        """Returns the cached hash of a container or hashes it."""
+        entry = self.cache.get(id(value))
+        if entry is not None and entry[0] is value:
+            return entry[1]
+
+        for hashes in self.previous:
+            entry = hashes.get(id(value))
+            if entry is not None and entry[0] is value:
+                self.cache[id(value)] = entry
+                if entry[2]:
+                    self._keep(entry)
+                return entry[1]
+
+        entry = (value, *self.hash_container(value))
+        self.cache[id(value)] = entry
+        return entry[1]
+
+    def _keep(self, entry):
+        """Copies the entries of the nested containers of a cached entry from 'previous'."""
+        cache, previous = self.cache, self.previous
+        stack = [entry]
+        while stack:
+            for child in stack.pop()[2]:
+                if id(child) in cache:
+                    continue
+                for hashes in previous:
+                    nested = hashes.get(id(child))
+                    if nested is not None and nested[0] is child:
+                        cache[id(child)] = nested
+                        stack.append(nested)
+                        break
+
+    def hash_container(self, value):
+        """
+        Hashes the encoded keys and the values, nested containers by their hash.
+        Returns the hash and the nested containers.
+        """
+        name_of = self.name_of
+        children = []
+        if isinstance(value, dict):
+            parts = [b'd%d:' % len(value)]
+            if _STR_TYPES.issuperset(map(type, value)):
+                keys = sorted(value)
+            else:
+                # e.g. integer keys of YAML files
+                keys = sorted(value, key=lambda key: _encode(key, name_of))
+
+            for key in keys:
+                val = value[key]
+                parts.append(_encode(key, name_of))
+                if isinstance(val, _CONTAINERS):
+                    parts.append(b'h' + self.digest(val))
+                    children.append(val)
+                else:
+                    parts.append(_encode(val, name_of, key == CLASS_TAG))
+        else:
+            parts = [b'l%d:' % len(value)]
+            for val in value:
+                if isinstance(val, _CONTAINERS):
+                    parts.append(b'h' + self.digest(val))
+                    children.append(val)
+                else:
+                    parts.append(_encode(val, name_of))
+        return self.sha256(b''.join(parts)).digest(), children or ()
+
+
+def _encode(value, name_of, is_class=False):
+    """Encodes a value with its type, so different values never have the same encoding."""
+    if isinstance(value, str):
+        # the class of a configured object is hashed like the imported class
+        text = value.encode('utf-8', 'surrogatepass')
+        return (b'o%d:' if is_class else b's%d:') % len(text) + text
+    if isinstance(value, bool):
+        return b'b1' if value else b'b0'
+    if isinstance(value, int):
+        return b'i%d:' % value
+    if isinstance(value, float):
+        return b'f' + repr(float(value)).encode() + b':'
+    if value is None:
+        return b'n'
+
+    name = name_of(value)
+    if name is None:
+        raise TypeError(f'Unable to hash {type(value).__name__} object, only imported objects can be hashed.')
+    text = name.encode('utf-8', 'surrogatepass')
+    return b'o%d:' % len(text) + text
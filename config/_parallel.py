@@ -0,0 +1,201 @@
+"""_parallel.py: Parallel instantiation of configured objects.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Loads the objects of a Python structure in parallel. Objects depend on the
+objects in their parameters, which have to be created first. The objects
+form a dependency graph: objects without nested objects are created first,
+and every other object is submitted to the executor as soon as all of its
+own nested objects are created. The time is bounded by the slowest chain of
+dependent objects, not by the slowest object of every nesting level.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+# pylint: disable=import-outside-toplevel
+
+import logging
+from collections import namedtuple
+
+from .constants import CLASS_TAG, OBJECT_PARM_TAG, PREFETCH_WORKERS
+from ._utils import import_object, instantiate, join_path
+from ._profile import bind
+
+
+__all__ = ['InstantiationError', 'load_objects_parallel']
+LOG = logging.getLogger('Config')
+
+
+class InstantiationError(Exception):
+    """Raised if objects could not be created.
+
+    The attribute 'errors' maps the path of each failed object to its exception.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        lines = '\n'.join(f'  {path}: {ex!r}' for path, ex in errors.items())
+        super().__init__(f'Unable to create {len(errors)} object(s):\n{lines}')
+
+
+# An object specification in a structure and the objects it depends on, 'index' is its position
+# in the list of all nodes. Parameters are containers, so nodes are looked up by index, not hashed.
+_Node = namedtuple('_Node', ['index', 'path', 'cls', 'params', 'children', 'toplevel'])
+
+
+def _plan(val, path, nodes, toplevel):
+    """Replaces all object specifications of 'val' by nodes.
+
+    :return: The structure and the nodes directly contained in it
+    """
+    if isinstance(val, list):
+        planned = [_plan(v, join_path(path, i), nodes, toplevel) for i, v in enumerate(val)]
+        return [v for v, _ in planned], [node for _, children in planned for node in children]
+
+    if isinstance(val, dict) and CLASS_TAG not in val:
+        planned = {k: _plan(v, join_path(path, k), nodes, toplevel) for k, v in val.items()}
+        return {k: v for k, (v, _) in planned.items()}, [node for _, children in planned.values() for node in children]
+
+    if isinstance(val, dict):
+        params, children = _plan(val.get(OBJECT_PARM_TAG, {}), join_path(path, OBJECT_PARM_TAG), nodes, False)
+        node = _Node(len(nodes), path, val[CLASS_TAG], params, children, toplevel)
+        nodes.append(node)
+        return node, [node]
+
+    return val, []
+
+
+def _materialize(val, objects):
+    """Replaces all nodes of a planned structure by the created objects."""
+    if isinstance(val, _Node):
+        return objects[val.index]
+
+    if isinstance(val, list):
+        return [_materialize(v, objects) for v in val]
+
+    if isinstance(val, dict):
+        return {k: _materialize(v, objects) for k, v in val.items()}
+
+    return val
+
+
+class _Scheduler:
+    """Creates the objects of a dependency graph in an executor, every object
+    as soon as all objects in its parameters are created."""
+
+    def __init__(self, executor, nodes, args, kwargs):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.executor = executor
+        # Only threads can record into the statistics of this thread, processes would have to pickle the recorder
+        self.create = bind(instantiate) if isinstance(executor, ThreadPoolExecutor) else instantiate
+        self.nodes = nodes
+        self.args = args
+        self.kwargs = kwargs
+        # number of nested objects every object still waits for, and the objects waiting for it
+        self.remaining = [len(node.children) for node in nodes]
+        self.dependents = [[] for _ in nodes]
+        for node in nodes:
+            for child in node.children:
+                self.dependents[child.index].append(node)
+
+        # created objects by node index, exceptions by path and running nodes by future
+        self.objects = {}
+        self.errors = {}
+        self.futures = {}
+
+    def submit(self, node):
+        """Submits the creation of an object whose nested objects are created."""
+        try:
+            cls = import_object(node.cls)
+            params = _materialize(node.params, self.objects)
+            args, kwargs = (self.args, self.kwargs) if node.toplevel else ((), {})
+            self.futures[self.executor.submit(self.create, cls, params, args, kwargs)] = node
+        except Exception as ex:  # pylint: disable=broad-except
+            self.errors[node.path] = ex
+
+    def run(self):
+        """Creates all objects, objects depending on a failed object are skipped.
+
+        :return: The created objects by node index and the exceptions by path
+        """
+        from concurrent.futures import wait, FIRST_COMPLETED
+
+        for node in self.nodes:
+            if not node.children:
+                self.submit(node)
+
+        while self.futures:
+            done, _ = wait(self.futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._collect(future)
+
+        return self.objects, self.errors
+
+    def _collect(self, future):
+        node = self.futures.pop(future)
+        try:
+            self.objects[node.index] = future.result()
+        except Exception as ex:  # pylint: disable=broad-except
+            self.errors[node.path] = ex
+            return
+
+        for dependent in self.dependents[node.index]:
+            self.remaining[dependent.index] -= 1
+            if not self.remaining[dependent.index]:
+                self.submit(dependent)
+
+
+def _executor(parallel):
+    """Returns the executor 'parallel' or a thread pool for True or a number of threads."""
+    from concurrent.futures import Executor, ThreadPoolExecutor
+
+    if isinstance(parallel, Executor):
+        return parallel
+    return ThreadPoolExecutor(max_workers=PREFETCH_WORKERS if parallel is True else parallel)
+
+
+def load_objects_parallel(val, args=(), kwargs=None, parallel=True, path=''):
+    """
+    Loads the objects of a Python structure like 'load_objects', but creates
+    independent objects in parallel.
+
+    :param val: Python structure to iterate through
+    :param args: Positional argument for the constructors of the toplevel objects
+    :param kwargs: Additional (override) arguments for the constructors of the toplevel objects
+    :param parallel: An executor, the number of threads or True to use a thread pool
+                        with 'PREFETCH_WORKERS' threads. Objects created by a process
+                        pool are not profiled.
+    :param path: Path of 'val' used in error messages
+    :return: 'val' with loaded objects
+    :raises InstantiationError: If any object could not be created
+    """
+    nodes = []
+    structure, _ = _plan(val, path, nodes, True)
+    if not nodes:
+        return structure
+
+    executor = _executor(parallel)
+    try:
+        objects, errors = _Scheduler(executor, nodes, args, kwargs or {}).run()
+    finally:
+        if executor is not parallel:
+            executor.shutdown()
+
+    for node in nodes:
+        if node.index not in objects and node.path not in errors:
+            LOG.debug('Skip object %s, a dependency failed.', node.path)
+
+    if errors:
+        ex = InstantiationError(errors)
+        LOG.exception(ex)
+        raise ex
+
+    return _materialize(structure, objects)
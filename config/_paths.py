@@ -0,0 +1,146 @@
+"""_paths.py: Compiled dotted paths to nested config values.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+A dotted path, e.g. 'model.layers.3.units', addresses a nested value of a
+config. Compiling a path splits it once and converts its integer keys, so
+repeated lookups and overrides do not have to parse the path again.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+import functools
+
+from .constants import PATH_CACHE_SIZE
+from ._utils import try_to_number, join_path
+
+
+__all__ = ['KeyPath', 'compile_path', 'build_index']
+
+
+class KeyPath:
+    """A compiled dotted path.
+
+    :param path: Dotted path string or sequence of keys
+    """
+
+    __slots__ = ('path', 'keys', 'indices')
+
+    def __init__(self, path):
+        self.keys = tuple(path.split('.')) if isinstance(path, str) else tuple(str(key) for key in path)
+        self.path = '.'.join(self.keys)
+        # list index of every key, None if the key is not an integer
+        self.indices = tuple(index if isinstance(index, int) else None for index in map(try_to_number, self.keys))
+
+    def __repr__(self):
+        return f'KeyPath({self.path!r})'
+
+    def __eq__(self, other):
+        return isinstance(other, KeyPath) and self.path == other.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, collection, default=None, start=0):
+        """Returns the value of the path in 'collection' or 'default' if it does not exist.
+
+        :param start: Index of the first key to look up
+        """
+        for key, index in zip(self.keys[start:], self.indices[start:]):
+            if isinstance(collection, dict) and key in collection:
+                collection = collection[key]
+            elif isinstance(collection, list) and index is not None and 0 <= index < len(collection):
+                collection = collection[index]
+            else:
+                return default
+        return collection
+
+    def replace(self, collection, value, start=0, owned=None):
+        """
+        Sets the value of the path like a commandline override without modifying
+        'collection'. Only the dictionaries and lists along the path are copied, all
+        other values are shared with 'collection'. Missing containers are created,
+        a list if the following key is an integer, otherwise a dictionary. Missing
+        list items are appended.
+
+        :param collection: Dictionary or list to set the value in; if it is missing
+                            (no dictionary or list) a new container is created
+        :param value: The new value
+        :param start: Index of the first key of the path in 'collection'
+        :param owned: optional;
+            Containers copied by previous calls, by id. They are modified in place
+            instead of copied again, so setting several paths one after another
+            copies every container once. New copies are added.
+        :return: A copy of 'collection' containing 'value'
+        """
+        owned = {} if owned is None else owned
+        key, index = self.keys[start], self.indices[start]
+        collection = _own(collection, index, owned)
+        if isinstance(collection, dict):
+            idx = key if key in collection or index is None else index
+        else:
+            idx = index if index is not None and 0 <= index < len(collection) else None
+
+        if start == len(self.keys) - 1:
+            if idx is None:
+                collection.append(value)
+            else:
+                collection[idx] = value
+        elif idx is None:
+            collection.append(self.replace(None, value, start + 1, owned))
+        elif isinstance(collection, dict) and key not in collection:
+            collection[key] = self.replace(None, value, start + 1, owned)
+        else:
+            collection[idx] = self.replace(collection[idx], value, start + 1, owned)
+
+        return collection
+
+
+def _own(collection, index, owned):
+    """Returns 'collection' if it is in 'owned', otherwise a copy of it or a new container
+    if it is no dictionary or list, a list if 'index' is an integer. Copies are added to 'owned'."""
+    if id(collection) in owned:
+        return collection
+
+    if isinstance(collection, dict):
+        copy = dict(collection)
+    elif isinstance(collection, list):
+        copy = list(collection)
+    else:
+        copy = [] if index is not None else {}
+    # the copies are kept alive by 'owned', so their ids are not reused
+    owned[id(copy)] = copy
+    return copy
+
+
+@functools.lru_cache(maxsize=PATH_CACHE_SIZE)
+def compile_path(path):
+    """Returns the compiled version of a dotted path; compiled paths are cached."""
+    if isinstance(path, KeyPath):
+        return path
+    return KeyPath(path)
+
+
+def build_index(name, value):
+    """Returns a dictionary mapping the dotted paths of 'value' and all values nested
+    in it to the values, 'name' is the path of 'value'."""
+    index = {}
+    stack = [(name, value)]
+    while stack:
+        path, value = stack.pop()
+        index[path] = value
+        if isinstance(value, dict):
+            stack.extend((join_path(path, key), val) for key, val in value.items())
+        elif isinstance(value, list):
+            stack.extend((join_path(path, i), val) for i, val in enumerate(value))
+    return index
@@ -0,0 +1,215 @@
+"""_profile.py: Timing instrumentation of the config load pipeline.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Records how long the stages of loading a config take, e.g. reading and
+parsing files, loading parent and included configs, importing and creating
+objects. Stages are recorded as spans into the 'LoadStats' of the config
+that is currently loaded by the thread. Without an active recorder a span
+does nothing, so the instrumentation costs almost nothing if profiling is
+disabled.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+# pylint: disable=import-outside-toplevel
+
+import os
+import time
+import threading
+import functools
+import contextlib
+from collections import namedtuple
+
+from .constants import ENV_PROFILE_NAME
+
+
+__all__ = ['Event', 'LoadStats', 'profiling_enabled', 'current', 'recording', 'paused', 'span', 'bind']
+
+Event = namedtuple('Event', ['stage', 'name', 'start', 'duration', 'thread'])
+
+_LOCAL = threading.local()
+
+
+def profiling_enabled(profile=None):
+    """Returns if profiling is enabled by argument or by the environment variable 'ENV_PROFILE_NAME'."""
+    if profile is not None:
+        return bool(profile)
+    return os.getenv(ENV_PROFILE_NAME, '').lower() not in ('', '0', 'false', 'no', 'off')
+
+
+class LoadStats:
+    """
+    Timings and counts recorded while loading a config.
+
+    Every event is a span of a stage, e.g. 'read', with the name of the file
+    or object it belongs to. Spans of nested stages overlap, e.g. the 'load'
+    span of a file contains the 'load' spans of its parent files, so the
+    times of the stages are inclusive.
+    """
+
+    def __init__(self):
+        self.created = time.perf_counter()
+        self.events = []
+
+    def record(self, stage, name, start, duration):
+        """Adds an event, 'start' is a value of 'time.perf_counter'."""
+        self.events.append(Event(stage, name, start - self.created, duration, threading.get_ident()))
+
+    def stages(self):
+        """Returns the number of events and the total time in seconds per stage."""
+        stages = {}
+        for event in self.events:
+            stage = stages.setdefault(event.stage, {'count': 0, 'time': 0.0})
+            stage['count'] += 1
+            stage['time'] += event.duration
+        return stages
+
+    def names(self, stage=None):
+        """Returns the number of events and the total time in seconds per file or object
+        and stage, e.g. {'configs/config.json': {'read': {'count': 1, 'time': 0.001}}}.
+
+        :param stage: optional;
+            Only return the events of this stage.
+        """
+        names = {}
+        for event in self.events:
+            if event.name is None or stage is not None and event.stage != stage:
+                continue
+            entry = names.setdefault(event.name, {}).setdefault(event.stage, {'count': 0, 'time': 0.0})
+            entry['count'] += 1
+            entry['time'] += event.duration
+        return names
+
+    def to_dict(self):
+        """Returns a structured report of all stages, files, objects and events."""
+        return {
+            'stages': self.stages(),
+            'names': self.names(),
+            'events': [event._asdict() for event in self.events],
+        }
+
+    def to_chrome_trace(self):
+        """Returns the events in the Chrome trace event format, see 'chrome://tracing'."""
+        pid = os.getpid()
+        events = [{'name': event.name if event.name is not None else event.stage,
+                   'cat': event.stage,
+                   'ph': 'X',
+                   'ts': event.start * 1e6,
+                   'dur': event.duration * 1e6,
+                   'pid': pid,
+                   'tid': event.thread}
+                  for event in self.events]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save(self, filename, format='json'):  # pylint: disable=redefined-builtin
+        """Writes the statistics to a JSON file.
+
+        :param filename: Path of the file
+        :param format: 'json' for the report of 'to_dict' or 'chrome' for a
+                        Chrome trace, which can be opened with 'chrome://tracing'
+        """
+        import json
+
+        if format == 'json':
+            data = self.to_dict()
+        elif format == 'chrome':
+            data = self.to_chrome_trace()
+        else:
+            raise ValueError(f'Unknown profile format {format}!')
+
+        with open(filename, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2, default=str)
+
+
+def current():
+    """Returns the statistics recorded by the current thread or None."""
+    return getattr(_LOCAL, 'stats', None)
+
+
+@contextlib.contextmanager
+def recording(stats):
+    """Records the spans of the current thread into 'stats'; if 'stats' is None
+    the current recorder is kept."""
+    if stats is None:
+        yield
+        return
+
+    previous = current()
+    _LOCAL.stats = stats
+    try:
+        yield
+    finally:
+        _LOCAL.stats = previous
+
+
+@contextlib.contextmanager
+def paused():
+    """Records no spans of the current thread, e.g. while loading a config which is not profiled."""
+    previous = current()
+    _LOCAL.stats = None
+    try:
+        yield
+    finally:
+        _LOCAL.stats = previous
+
+
+class _Span:
+    __slots__ = ('stats', 'stage', 'name', 'start')
+
+    def __init__(self, stats, stage, name):
+        self.stats = stats
+        self.stage = stage
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.record(self.stage, self.name, self.start, time.perf_counter() - self.start)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(stage, name=None):
+    """Returns a context manager recording the time of a stage, e.g.
+    'with span('read', path): ...'. Does nothing if the thread records no statistics."""
+    stats = getattr(_LOCAL, 'stats', None)
+    if stats is None:
+        return _NO_SPAN
+    return _Span(stats, stage, None if name is None else str(name))
+
+
+def bind(function):
+    """Returns 'function' recording into the statistics of the current thread,
+    also if it is called by another thread, e.g. a worker of an executor."""
+    stats = current()
+    if stats is None:
+        return function
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with recording(stats):
+            return function(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,562 @@
+"""_schema.py: Schema validation and type coercion of config values.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Compiles a schema into a validator function, which checks a config tree in a
+single pass, coerces values to the expected types and collects every error
+with the dotted path of the value. Schemas can be
+
+- types, e.g. 'int' or 'MyModel', and 'typing' types, e.g. 'List[int]',
+  'Dict[str, float]', 'Optional[str]' or 'Union[int, str]',
+- dictionaries mapping keys to schemas and lists with a single item schema,
+  e.g. {'lr': float, 'layers': [int]},
+- dataclasses and classes with type annotations, e.g. 'TypedDict's,
+- JSON Schema dictionaries (the keywords 'type', 'properties', 'required',
+  'additionalProperties', 'items', 'enum', 'anyOf' and numeric and length bounds).
+  A dictionary is a JSON Schema if it has a '$schema' key or if it uses these
+  keywords and contains JSON values only, so config keys like 'items' or 'type'
+  can still be described by dictionaries of Python types, e.g. {'items': [int]}.
+
+Dictionaries, dataclasses and annotated classes reject unknown keys, so typos
+are reported. Keys are optional if their type is 'Optional' or they have a
+default. Object specifications ('class' and 'params') are checked against the
+signature of their class: the class must be importable, all parameters must
+be accepted by the constructor and annotated parameters are validated.
+
+Compiled validators are cached per schema, schemas must not be modified
+after they were used.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+# pylint: disable=import-outside-toplevel
+
+import operator
+import threading
+
+from .constants import CLASS_TAG, OBJECT_PARM_TAG, SCHEMA_CACHE_SIZE
+from ._utils import import_object, join_path
+
+
+__all__ = ['ValidationError', 'compile_schema']
+
+_MISSING = object()
+_NoneType = type(None)
+
+_JSON_TYPES = {'string': (str, ), 'integer': (int, ), 'number': (int, float), 'boolean': (bool, ),
+               'null': (_NoneType, ), 'object': (dict, ), 'array': (list, )}
+_JSON_KEYWORDS = ('$schema', 'type', 'properties', 'items', 'anyOf', 'enum', 'additionalProperties')
+_BOOLEANS = {'true': True, 'false': False}
+# JSON Schema bounds mapped to the comparison of the size with the bound, which violates the bound
+_BOUNDS = {'minimum': operator.lt, 'maximum': operator.gt, 'exclusiveMinimum': operator.le,
+           'exclusiveMaximum': operator.ge, 'minLength': operator.lt, 'maxLength': operator.gt,
+           'minItems': operator.lt, 'maxItems': operator.gt}
+
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+class ValidationError(ValueError):
+    """Raised if a config does not match its schema.
+
+    The attribute 'errors' maps the dotted path of each invalid value to the error message.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        lines = '\n'.join(f'  {path or "<root>"}: {message}' for path, message in errors.items())
+        super().__init__(f'Invalid config, {len(errors)} error(s):\n{lines}')
+
+
+def compile_schema(schema=None, coerce=True, check_params=True):
+    """
+    Returns a validator function for a schema. The function is called with a
+    value, its dotted path and a dictionary collecting the errors by path. It
+    returns the value with coerced values; containers are only copied if a
+    nested value was coerced.
+
+    :param schema: The schema, see the module documentation; None accepts any value
+    :param coerce: If True, values are converted to the expected type if possible,
+                    e.g. '1e-3' or 1 to a float for 'float'
+    :param check_params: If True, the parameters of objects are checked against the
+                    signature of their class
+    :return: Validator function
+    """
+    try:
+        key = (schema, coerce, check_params)
+        hash(key)
+    except TypeError:
+        # unhashable schemas, e.g. dictionaries, are cached by identity
+        key = (id(schema), coerce, check_params)
+
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+    if cached is not None and (cached[0] is schema or key[0] is schema):
+        return cached[1]
+
+    validator = _Compiler(coerce, check_params).compile(schema)
+    with _CACHE_LOCK:
+        if len(_CACHE) >= SCHEMA_CACHE_SIZE:
+            _CACHE.pop(next(iter(_CACHE)))
+        # keep the schema alive, so its id is not reused
+        _CACHE[key] = (schema, validator)
+    return validator
+
+
+def _type_name(types):
+    if not isinstance(types, tuple):
+        types = (types, )
+    return ' or '.join('None' if typ is _NoneType else getattr(typ, '__name__', str(typ)) for typ in types)
+
+
+def _is_instance(value, types):
+    """Like 'isinstance', but bools are no numbers."""
+    if isinstance(value, bool) and bool not in types:
+        return False
+    return isinstance(value, types)
+
+
+def _coerce(value, types):
+    """Returns 'value' converted to the first possible type of 'types' or _MISSING."""
+    for typ in types:
+        if typ is float and isinstance(value, int) and not isinstance(value, bool):
+            return float(value)
+        if typ in (int, float) and isinstance(value, str):
+            try:
+                return typ(value)
+            except ValueError:
+                pass
+        if typ is int and isinstance(value, float) and value.is_integer():
+            return int(value)
+        if typ is bool and isinstance(value, str) and value.lower() in _BOOLEANS:
+            return _BOOLEANS[value.lower()]
+        if typ is list and isinstance(value, tuple):
+            return list(value)
+    return _MISSING
+
+
+def _is_object(value):
+    return isinstance(value, dict) and CLASS_TAG in value
+
+
+def _update(container, result, key, old, new):
+    """Returns a copy of 'container' with 'new' at 'key', copies only once per container."""
+    if new is old:
+        return result
+    if result is None:
+        result = dict(container) if isinstance(container, dict) else list(container)
+    result[key] = new
+    return result
+
+
+def _check_bound(value, bound, key):
+    """Returns the error message if 'value' violates the JSON Schema bound 'key', otherwise None."""
+    if key.endswith(('Length', 'Items')):
+        if not isinstance(value, (str, list)):
+            return None
+        size = len(value)
+    elif _is_instance(value, (int, float)):
+        size = value
+    else:
+        return None
+    return f'{key} is {bound}, got {size}' if _BOUNDS[key](size, bound) else None
+
+
+def _is_optional(schema):
+    if schema is None or schema is _NoneType:
+        return True
+    import typing
+    return getattr(schema, '__origin__', None) is typing.Union and _NoneType in schema.__args__
+
+
+def _is_json(value):
+    """Returns if 'value' only contains JSON values, e.g. no Python types."""
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_json(val) for key, val in value.items())
+    if isinstance(value, list):
+        return all(_is_json(val) for val in value)
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _is_json_schema(schema):
+    """Returns if a dictionary is a JSON Schema and not a dictionary mapping config keys to schemas."""
+    if '$schema' in schema:
+        return True
+    if not any(keyword in schema for keyword in _JSON_KEYWORDS) or not _is_json(schema):
+        return False
+
+    types = schema.get('type', 'object')
+    types = [types] if isinstance(types, str) else types
+    return (isinstance(types, list) and all(name in _JSON_TYPES for name in types)
+            and isinstance(schema.get('properties', {}), dict)
+            and all(isinstance(sub, dict) for sub in schema.get('properties', {}).values())
+            and isinstance(schema.get('items', {}), dict)
+            and isinstance(schema.get('anyOf', []), list)
+            and all(isinstance(sub, dict) for sub in schema.get('anyOf', []))
+            and isinstance(schema.get('enum', []), list)
+            and isinstance(schema.get('additionalProperties', True), (bool, dict)))
+
+
+class _Compiler:
+    """Compiles schemas into validator functions."""
+
+    def __init__(self, coerce, check_params):
+        import typing
+
+        self.coerce = coerce
+        self.check_params = check_params
+        self.signatures = {}
+        self.walk = self._compile_any()
+        # compile functions of schemas by type and of generic types by origin, e.g. 'list' for 'List[int]'
+        self.compilers = {dict: self._compile_dict, list: self._compile_item_list, type: self._compile_class_or_type}
+        self.generics = {typing.Union: self._compile_union_args, list: self._compile_list_args,
+                         typing.List: self._compile_list_args, tuple: self._compile_tuple_args,
+                         typing.Tuple: self._compile_tuple_args, dict: self._compile_dict_args,
+                         typing.Dict: self._compile_dict_args}
+        if getattr(typing, 'Literal', None) is not None:
+            self.generics[typing.Literal] = self._compile_literal_args
+
+    def compile(self, schema):
+        """Returns the validator function of a schema."""
+        import typing
+
+        if schema is None or schema is typing.Any or schema is object:
+            return self.walk
+
+        origin = getattr(schema, '__origin__', None)
+        if origin is not None:
+            return self._compile_generic(schema, origin)
+
+        for kind in type(schema).__mro__:
+            if kind in self.compilers:
+                return self.compilers[kind](schema)
+        raise ValueError(f'Unsupported schema {schema!r}')
+
+    def _compile_dict(self, schema):
+        if _is_json_schema(schema):
+            return self._compile_json(schema)
+        fields = {key: self.compile(value) for key, value in schema.items()}
+        required = {key for key, value in schema.items() if not _is_optional(value)}
+        return self._compile_mapping(fields, required, None)
+
+    def _compile_item_list(self, schema):
+        if len(schema) != 1:
+            raise ValueError(f'A list schema needs exactly one item schema, got {schema!r}')
+        return self._compile_list(self.compile(schema[0]))
+
+    def _compile_class_or_type(self, schema):
+        if schema.__module__ != 'builtins' and getattr(schema, '__annotations__', None):
+            return self._compile_class(schema)
+        return self._compile_type((schema, ))
+
+    def _compile_any(self):
+        if not self.check_params:
+            return lambda value, path, errors: value
+
+        def walk(value, path, errors):
+            if isinstance(value, dict):
+                if CLASS_TAG in value:
+                    return self.check_object(value, path, errors)
+                result = None
+                for key, val in value.items():
+                    result = _update(value, result, key, val, walk(val, join_path(path, key), errors))
+                return value if result is None else result
+            if isinstance(value, list):
+                result = None
+                for i, val in enumerate(value):
+                    result = _update(value, result, i, val, walk(val, join_path(path, i), errors))
+                return value if result is None else result
+            return value
+
+        return walk
+
+    def _compile_type(self, types, nested=True):
+        """Validator of the types 'types', if 'nested' is set the values in containers are checked too."""
+        coerce, walk = self.coerce, self.walk
+        containers = nested and any(typ in (dict, list) for typ in types)
+
+        def check(value, path, errors):
+            if _is_instance(value, types):
+                return walk(value, path, errors) if containers else value
+            if _is_object(value):
+                return self.check_object(value, path, errors, types)
+            if coerce:
+                coerced = _coerce(value, types)
+                if coerced is not _MISSING:
+                    return coerced
+            errors[path] = f'expected {_type_name(types)}, got {type(value).__name__}'
+            return value
+
+        return check
+
+    def _compile_mapping(self, fields, required, extra, cls=None):
+        """Validator of a dictionary with the validators 'fields' per key. Keys in 'required'
+        must exist, all other keys are checked by 'extra' or rejected if it is None."""
+
+        def check(value, path, errors):
+            if cls is not None and isinstance(value, cls):
+                return value
+            if not isinstance(value, dict):
+                errors[path] = f'expected mapping, got {type(value).__name__}'
+                return value
+            if cls is not None and CLASS_TAG in value:
+                return self.check_object(value, path, errors, (cls, ))
+
+            result = None
+            for key, val in value.items():
+                validator = fields.get(key, extra)
+                if validator is None:
+                    errors[join_path(path, key)] = 'unknown key'
+                    continue
+                result = _update(value, result, key, val, validator(val, join_path(path, key), errors))
+
+            for key in required:
+                if key not in value:
+                    errors[join_path(path, key)] = 'missing required value'
+            return value if result is None else result
+
+        return check
+
+    def _compile_list(self, item, length=None):
+        def check(value, path, errors):
+            if isinstance(value, tuple) and self.coerce:
+                value = list(value)
+            if not isinstance(value, list):
+                errors[path] = f'expected list, got {type(value).__name__}'
+                return value
+            if length is not None and len(value) != length:
+                errors[path] = f'expected {length} items, got {len(value)}'
+                return value
+
+            result = None
+            for i, val in enumerate(value):
+                validator = item[i] if isinstance(item, tuple) else item
+                result = _update(value, result, i, val, validator(val, join_path(path, i), errors))
+            return value if result is None else result
+
+        return check
+
+    def _compile_union(self, validators, name):
+        def check(value, path, errors):
+            for validator in validators:
+                nested = {}
+                result = validator(value, path, nested)
+                if not nested:
+                    return result
+            errors[path] = f'expected {name}, got {type(value).__name__}'
+            return value
+
+        return check
+
+    def _compile_generic(self, schema, origin):
+        args = getattr(schema, '__args__', None) or ()
+        compile_args = self.generics.get(origin)
+        if compile_args is not None:
+            return compile_args(args)
+        if isinstance(origin, type):
+            return self._compile_type((origin, ))
+        raise ValueError(f'Unsupported schema {schema!r}')
+
+    def _compile_union_args(self, args):
+        if all(isinstance(arg, type) and not getattr(arg, '__annotations__', None) for arg in args):
+            return self._compile_type(tuple(args))
+        return self._compile_union([self.compile(arg) for arg in args], _type_name(args))
+
+    def _compile_list_args(self, args):
+        return self._compile_list(self.compile(args[0] if args else None))
+
+    def _compile_tuple_args(self, args):
+        if not args or args[-1] is Ellipsis:
+            return self._compile_list_args(args)
+        return self._compile_list(tuple(self.compile(arg) for arg in args), length=len(args))
+
+    def _compile_dict_args(self, args):
+        return self._compile_mapping({}, set(), self.compile(args[1] if args else None))
+
+    def _compile_literal_args(self, args):
+        return self._compile_enum(args, self.walk)
+
+    def _compile_class(self, cls):
+        """Validator of a dictionary with the annotated fields of a class, e.g. a dataclass."""
+        import typing
+        try:
+            import dataclasses
+        except ImportError:
+            # Python 3.6
+            dataclasses = None
+
+        try:
+            hints = typing.get_type_hints(cls)
+        except Exception:  # pylint: disable=broad-except
+            # e.g. unresolvable forward references, check the type only
+            return self._compile_type((cls, ))
+        hints = {name: hint for name, hint in hints.items()
+                 if getattr(hint, '__origin__', None) is not typing.ClassVar}
+
+        if dataclasses is not None and dataclasses.is_dataclass(cls):
+            fields = dataclasses.fields(cls)
+            required = {field.name for field in fields if field.default is dataclasses.MISSING
+                        and field.default_factory is dataclasses.MISSING}
+            hints = {field.name: hints.get(field.name) for field in fields}
+        elif hasattr(cls, '__required_keys__'):
+            required = set(cls.__required_keys__)
+        else:
+            required = {name for name in hints if not hasattr(cls, name)}
+
+        required = {name for name in required if not _is_optional(hints[name])}
+        validators = {name: self.compile(hint) for name, hint in hints.items()}
+        return self._compile_mapping(validators, required, None, cls=cls)
+
+    def _compile_enum(self, values, validator):
+        def check(value, path, errors):
+            if value not in values:
+                errors[path] = f'expected one of {list(values)!r}, got {value!r}'
+                return value
+            return validator(value, path, errors)
+
+        return check
+
+    def _compile_json(self, schema):
+        """Validator of a JSON Schema."""
+        if 'anyOf' in schema:
+            return self._compile_union([self.compile(sub) for sub in schema['anyOf']], 'any of the schemas')
+
+        # nested values are checked by the validators of the properties and items
+        nested = not any(key in schema for key in ('properties', 'additionalProperties', 'items'))
+        types = schema.get('type')
+        if types is not None:
+            types = tuple(typ for name in ([types] if isinstance(types, str) else types) for typ in _JSON_TYPES[name])
+            validator = self._compile_type(types, nested=nested)
+        else:
+            validator = self.walk if nested else lambda value, path, errors: value
+
+        if 'properties' in schema or 'additionalProperties' in schema:
+            additional = schema.get('additionalProperties', True)
+            extra = self.walk if additional is True else None if additional is False else self.compile(additional)
+            fields = {key: self.compile(value) for key, value in schema.get('properties', {}).items()}
+            mapping = self._compile_mapping(fields, set(schema.get('required', ())), extra)
+            validator = self._chain(validator, dict, mapping)
+        if 'items' in schema:
+            validator = self._chain(validator, list, self._compile_list(self.compile(schema['items'])))
+        if 'enum' in schema:
+            validator = self._compile_enum(schema['enum'], validator)
+
+        bounds = [(schema[key], key) for key in ('minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum',
+                                                  'minLength', 'maxLength', 'minItems', 'maxItems') if key in schema]
+        if bounds:
+            validator = self._compile_bounds(validator, bounds)
+        return validator
+
+    @staticmethod
+    def _chain(first, cls, second):
+        """Runs 'second' after 'first' if the value is an instance of 'cls'."""
+        def check(value, path, errors):
+            value = first(value, path, errors)
+            return second(value, path, errors) if isinstance(value, cls) else value
+
+        return check
+
+    @staticmethod
+    def _compile_bounds(validator, bounds):
+        def check(value, path, errors):
+            value = validator(value, path, errors)
+            for bound, key in bounds:
+                error = _check_bound(value, bound, key)
+                if error is not None:
+                    errors[path] = error
+            return value
+
+        return check
+
+    def _signature(self, cls):
+        """Returns the signature of the constructor of 'cls' and validators of its
+        annotated parameters or None if the signature is not available."""
+        if cls in self.signatures:
+            return self.signatures[cls]
+
+        import inspect
+        import typing
+
+        try:
+            signature = inspect.signature(cls)
+        except (TypeError, ValueError):
+            signature = None
+
+        validators = {}
+        if signature is not None:
+            try:
+                hints = typing.get_type_hints(cls.__init__ if isinstance(cls, type) else cls)
+            except Exception:  # pylint: disable=broad-except
+                hints = {}
+            for name in signature.parameters:
+                if name in hints:
+                    try:
+                        validators[name] = self.compile(hints[name])
+                    except ValueError:
+                        pass
+
+        self.signatures[cls] = (signature, validators) if signature is not None else None
+        return self.signatures[cls]
+
+    def check_object(self, value, path, errors, types=None):
+        """Checks an object specification: its class has to be importable and an
+        instance of 'types' and the parameters have to match its signature."""
+        cls = self._import_class(value, path, errors, types)
+        signature = self._signature(cls) if cls is not None and self.check_params else None
+        params = value.get(OBJECT_PARM_TAG)
+        if params is None or signature is None:
+            return value
+
+        result = self._check_params(cls, params, signature, join_path(path, OBJECT_PARM_TAG), errors)
+        if result is None:
+            return value
+        value = dict(value)
+        value[OBJECT_PARM_TAG] = result
+        return value
+
+    @staticmethod
+    def _import_class(value, path, errors, types):
+        """Returns the class of an object specification or None if it is invalid."""
+        try:
+            cls = import_object(value[CLASS_TAG])
+        except Exception as ex:  # pylint: disable=broad-except
+            errors[join_path(path, CLASS_TAG)] = f'unable to import {value[CLASS_TAG]!r}: {ex!r}'
+            return None
+        if not callable(cls):
+            # 'import_object' returns the parent if an attribute is missing
+            errors[join_path(path, CLASS_TAG)] = f'unable to import {value[CLASS_TAG]!r}, it is not callable'
+            return None
+
+        if types is not None and not (isinstance(cls, type) and issubclass(cls, types)):
+            errors[path] = f'expected {_type_name(types)}, got {getattr(cls, "__name__", cls)}'
+            return None
+        return cls
+
+    def _check_params(self, cls, params, signature, path, errors):
+        """Returns the validated parameters of an object or None if they did not change."""
+        signature, validators = signature
+        try:
+            if isinstance(params, dict):
+                signature.bind_partial(**params)
+            else:
+                signature.bind_partial(*params)
+        except TypeError as ex:
+            errors[path] = f'invalid parameters for {getattr(cls, "__qualname__", cls)}: {ex}'
+            return None
+
+        result = None
+        if isinstance(params, dict):
+            for name, val in params.items():
+                validator = validators.get(name, self.walk)
+                result = _update(params, result, name, val, validator(val, join_path(path, name), errors))
+        else:
+            for i, val in enumerate(params):
+                result = _update(params, result, i, val, self.walk(val, join_path(path, i), errors))
+        return result
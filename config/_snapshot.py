@@ -0,0 +1,153 @@
+"""_snapshot.py: Compiled snapshots of fully loaded configs.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+A snapshot stores the merged values of a config, i.e. after loading all
+parent and included files, next to the config file. It starts with a
+manifest of all files the values were loaded from, including their size,
+modification time and SHA-256 hash. A snapshot is used only as long as
+none of these files changed. Imported objects are stored by their import
+tag and imported again when the snapshot is loaded, so also modules and
+other objects which can not be pickled can be part of a snapshot.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+# pylint: disable=import-outside-toplevel
+
+import os
+import logging
+from pathlib import Path
+
+from .constants import SNAPSHOT_SUFFIX, IMPORT_TAG
+from ._utils import import_object
+
+
+__all__ = ['snapshot_path', 'load_snapshot', 'save_snapshot']
+LOG = logging.getLogger('Config')
+
+SNAPSHOT_VERSION = 3
+
+
+def snapshot_path(cfile):
+    """Returns the path of the snapshot for config file 'cfile'."""
+    cfile = Path(cfile)
+    return cfile.with_name(cfile.name + SNAPSHOT_SUFFIX)
+
+
+def _hash_file(path):
+    import hashlib
+
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def _describe(path):
+    path = str(Path(path).resolve())
+    stat = os.stat(path)
+    return {'path': path, 'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': _hash_file(path)}
+
+
+def _is_unchanged(dependency):
+    try:
+        stat = os.stat(dependency['path'])
+        if stat.st_size != dependency['size']:
+            return False
+        if stat.st_mtime_ns == dependency['mtime']:
+            return True
+        return _hash_file(dependency['path']) == dependency['sha256']
+    except OSError:
+        return False
+
+
+def _import_id(imports):
+    """Returns a 'persistent_id' function of a pickler storing imported objects by their import tag.
+
+    :param imports: Imported objects by id, mapped to the object and its import tag
+    """
+    def persistent_id(obj):
+        entry = imports.get(id(obj))
+        return entry[1] if entry is not None and entry[0] is obj else None
+
+    return persistent_id
+
+
+def load_snapshot(cfile, lazy=False):
+    """Loads the snapshot of 'cfile'.
+
+    :param cfile: Path of the config file
+    :param lazy: Whether the snapshot has to be written by a config in lazy mode
+    :return: Dictionary with the 'values', 'unresolved' values, the 'imports' and
+            the 'sources' of the config, mapped to their modification time and size,
+            or None if there is no valid snapshot
+    """
+    path = snapshot_path(cfile)
+    if not path.exists():
+        return None
+
+    import pickle
+
+    try:
+        with open(path, 'rb') as file:
+            manifest = pickle.load(file)
+            if manifest.get('version') != SNAPSHOT_VERSION or manifest.get('lazy') != lazy:
+                LOG.debug('Snapshot %s has a different version or mode.', path)
+                return None
+
+            if not all(_is_unchanged(dep) for dep in manifest['dependencies']):
+                LOG.debug('Snapshot %s is outdated.', path)
+                return None
+
+            unpickler = pickle.Unpickler(file)
+            # imported objects are stored by their import tag
+            unpickler.persistent_load = lambda tag: import_object(tag[len(IMPORT_TAG):])
+            state = unpickler.load()
+    except Exception:  # pylint: disable=broad-except
+        LOG.warning('Unable to load config snapshot %s.', path, exc_info=True)
+        return None
+
+    LOG.debug('Load config from snapshot %s.', path)
+    state['sources'] = {Path(dep['path']): (dep['mtime'], dep['size']) for dep in manifest['dependencies']}
+    return state
+
+
+def save_snapshot(cfile, values, unresolved, sources, imports=(), *, lazy=False):
+    """Writes a snapshot for 'cfile'.
+
+    :param cfile: Path of the config file
+    :param values: Merged config values
+    :param unresolved: Unresolved values of a config in lazy mode
+    :param sources: Paths of all files the values were loaded from
+    :param imports: Imported objects and their import tags, e.g. to save them with the same tag
+    :param lazy: Whether the config is in lazy mode
+    :return: True if the snapshot was written
+    """
+    import pickle
+
+    path = snapshot_path(cfile)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+
+    try:
+        dependencies = [_describe(source) for source in dict.fromkeys(sources)]
+        with open(tmp_path, 'wb') as file:
+            pickle.dump({'version': SNAPSHOT_VERSION, 'lazy': lazy, 'dependencies': dependencies},
+                        file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickler = pickle.Pickler(file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickler.persistent_id = _import_id({id(obj): (obj, tag) for obj, tag in imports})
+            pickler.dump({'values': values, 'unresolved': unresolved, 'imports': list(imports)})
+        os.replace(tmp_path, path)
+    except Exception:  # pylint: disable=broad-except
+        LOG.warning('Unable to write config snapshot %s.', path, exc_info=True)
+        if tmp_path.exists():
+            tmp_path.unlink()
+        return False
+
+    LOG.debug('Saved config snapshot %s.', path)
+    return True
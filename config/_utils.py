@@ -14,29 +14,49 @@ Version  Date        Author             Description
 
 """
 
+# pylint: disable=import-outside-toplevel
+
+import sys
 import logging
 import importlib
-import argparse
+import functools
 
-from .constants import CLASS_TAG, OBJECT_PARM_TAG, CONFIG_ARG_TAG
+from .constants import CLASS_TAG, OBJECT_PARM_TAG, CONFIG_ARG_TAG, IMPORT_CACHE_SIZE
+from ._backends import get_file_loader, get_file_stream_loader, get_file_writer, to_serializable
+from ._profile import span
 
 
-__all__ = ['parse_args', 'extract_named_args', 'try_to_number', 'get_file_loader', 'get_file_writer',
-           'import_object', 'load_objects', 'get_key', 'evaluate']
+__all__ = ['parse_args', 'extract_named_args', 'try_to_number', 'get_file_loader', 'get_file_stream_loader',
+           'get_file_writer', 'to_serializable', 'import_object', 'clear_import_cache', 'load_objects', 'instantiate',
+           'get_key', 'parse_value', 'join_path']
 
 
 def parse_args(expect_file=True):
     """
     Configure and run ArgumentParser for ConfigTool.
 
+    The result is cached for the current 'sys.argv', so the commandline is
+    parsed only once per process.
+
     :param expect_file: expect config file definitions
 
     :return: config file argument and override arguments
     """
+    args, override_args = _parse_args(tuple(sys.argv[1:]), expect_file)
+    if override_args is not None:
+        override_args = list(override_args)
+    return args, override_args
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_args(argv, expect_file):
+    # argparse is imported only if the commandline is parsed
+    import argparse
+
     parser = argparse.ArgumentParser()
     if expect_file:
         parser.add_argument(CONFIG_ARG_TAG, type=str, default=None, help="JSON file with the model params")
-    args, override_args = parser.parse_known_args()
+    args, override_args = parser.parse_known_args(list(argv))
     if len(override_args) == 0:
         override_args = None
     return args, override_args
@@ -77,86 +97,29 @@ def try_to_number(value):
     return value
 
 
-def get_file_loader(ext):
-    """Returns a load function for a given file extension."""
-    # pylint: disable=import-outside-toplevel
-    ext = ext.lower()[1:]
-    try:
-        if ext == '.json':
-            try:
-                import json
-            except ImportError:
-                logging.error('Error importing: json', exc_info=True)
-            return json.loads
-
-        if ext == '.json5':
-            try:
-                import json5
-            except ImportError:
-                logging.error('Error importing: json', exc_info=True)
-            return json5.loads
-
-        if ext == '.xml':
-            try:
-                import xmltodict
-            except ImportError:
-                logging.error('Error importing: json', exc_info=True)
-            return xmltodict.parse
-
-        if ext in ('.yml', '.yaml'):
-            try:
-                import yaml
-            except ImportError:
-                logging.error('Error importing: json', exc_info=True)
-            return yaml.load
-
-        ex = Exception(f"Unknown configuration filetype {ext}!")
-        logging.exception(ex)
-        raise ex
-    except ImportError as ex:
-        logging.exception(ex)
-
-
-def get_file_writer(ext):
-    """Returns a write function for a given file extension."""
-    # pylint: disable=import-outside-toplevel
-    ext = ext.lower()[1:]
-    try:
-        if ext == '.json':
-            try:
-                import json
-            except ImportError:
-                logging.error('Error importing: json', exc_info=True)
-            return json.dump
-
-        if ext == '.json5':
-            try:
-                import json5
-            except ImportError:
-                logging.error('Error importing: json', exc_info=True)
-            return json5.dump
-
-        if ext in ('.yml', '.yaml'):
-            try:
-                import yaml
-            except ImportError:
-                logging.error('Error importing: json', exc_info=True)
-            return yaml.load
+def import_object(objname):
+    """Import a Pyhton object specified a string.
 
-        ex = Exception(f"Unknown configuration filetype {ext}!")
-        logging.exception(ex)
-        raise ex
-    except ImportError as ex:
-        logging.exception(ex)
+    Resolved objects are kept in a bounded, thread-safe LRU cache keyed by 'objname'.
+    Use 'clear_import_cache' to invalidate it, e.g. after reloading a module.
+    Every call is recorded as 'import' span, also if the object is cached.
+    """
+    with span('import', objname):
+        return _import_object(objname)
 
 
-def import_object(objname):
-    """Import a Pyhton object specified a string."""
+@functools.lru_cache(maxsize=IMPORT_CACHE_SIZE)
+def _import_object(objname):
     module_str = objname.split('.', maxsplit=1)
     objmodule = importlib.import_module(module_str[0])
     return _get_rec_attr(objmodule, module_str[-1])
 
 
+def clear_import_cache():
+    """Drops all objects cached by 'import_object'."""
+    _import_object.cache_clear()
+
+
 def _get_rec_attr(obj, attrstr):
     """Get attributes and do so recursively if needed"""
     if attrstr is None:
@@ -215,17 +178,24 @@ def _load_configured_object(obj, *args, instance=True, **kwargs):
         if OBJECT_PARM_TAG in obj:
             params = load_objects(obj[OBJECT_PARM_TAG])
 
-        assert isinstance(params, (dict, list))
-        if isinstance(params, dict):
-            kwargs.update(params)
-        else:
-            args += tuple(params)
-
-        return cls(*args, **kwargs)
+        return instantiate(cls, params, args, kwargs)
 
     return obj
 
 
+def instantiate(cls, params, args=(), kwargs=None):
+    """Creates an object of 'cls' from its loaded 'params' and additional arguments."""
+    kwargs = dict(kwargs or {})
+    assert isinstance(params, (dict, list))
+    if isinstance(params, dict):
+        kwargs.update(params)
+    else:
+        args = tuple(args) + tuple(params)
+
+    with span('instantiate', getattr(cls, '__qualname__', cls)):
+        return cls(*args, **kwargs)
+
+
 def get_key(colletion, key):
     """Returns a valid key for a collection or None"""
     if isinstance(colletion, dict) and key in colletion:
@@ -238,15 +208,80 @@ def get_key(colletion, key):
     return None
 
 
-def evaluate(value):
-    """Evaluate a string as Python expression"""
+_CONSTANTS = {'True': True, 'False': False, 'None': None, 'true': True, 'false': False, 'null': None}
+_NUMBER_START = frozenset('0123456789+-.')
+_LITERAL_START = frozenset('[{(\'"')
+_SPECIAL_FLOATS = frozenset(('nan', 'inf', 'infinity'))
+_UNPARSED = object()
+
+
+def parse_value(value):
+    """
+    Parses a commandline value into a Python literal without evaluating code.
+
+    Supported are bools and None (also as 'true', 'false' and 'null'), numbers,
+    quoted strings, lists, tuples and dicts of Python or JSON literals. All other
+    values, e.g. unquoted text or expressions, are returned as string.
+
+    :param value: Value string, other types are returned unchanged
+    :return: The parsed value
+    """
     if not isinstance(value, str):
         return value
 
+    text = value.strip()
+    first = text[:1]
+    if text in _CONSTANTS:
+        parsed = _CONSTANTS[text]
+    elif first in _NUMBER_START:
+        parsed = _parse_number(text)
+    elif first in '"\'' and len(text) > 1 and text[-1] == first and first not in text[1:-1] and '\\' not in text:
+        # fast path for simple quoted strings
+        parsed = text[1:-1]
+    elif first in '[{':
+        parsed = _parse_json(text)
+    elif first not in _LITERAL_START:
+        # fast path for plain strings
+        parsed = float(text) if text.lower() in _SPECIAL_FLOATS else value
+    else:
+        parsed = _UNPARSED
+
+    if parsed is _UNPARSED:
+        parsed = _parse_literal(text, value)
+    return parsed
+
+
+def _parse_number(text):
+    """Returns the int or float of 'text' or '_UNPARSED'."""
+    digits = text.lstrip('+-')
     try:
-        # pylint: disable=eval-used
-        value = eval(value)
-    except (ValueError, SyntaxError):
-        pass
+        return int(text) if digits.isdigit() or '_' in digits else float(text)
+    except ValueError:
+        return _UNPARSED
 
-    return value
+
+def _parse_json(text):
+    """Returns the JSON value of 'text' or '_UNPARSED'."""
+    # JSON is parsed by a C extension, Python literals like 'None' or single quotes are not JSON
+    import json
+    if "'" in text and '"' not in text and '\\' not in text:
+        # without double quotes and escapes, single quoted strings only differ from JSON in their quotes
+        text = text.replace("'", '"')
+    try:
+        return json.loads(text)
+    except ValueError:
+        return _UNPARSED
+
+
+def _parse_literal(text, value):
+    """Returns the Python literal of 'text' or 'value' if it is no literal."""
+    import ast
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return value
+
+
+def join_path(path, key):
+    """Appends 'key' to the dotted 'path' of a value."""
+    return f'{path}.{key}' if path else str(key)
@@ -14,22 +14,402 @@ Version  Date        Author             Description
 =======  ==========  =================  ================================
 v0.1     1/1/17      Markus Hofmarcher
 v0.2     4/12/2021   Christian Huber    Generalise the concept.
+v0.3     10/16/2026  Christian Huber    Share values of cached files.
 =======  ==========  =================  ================================
 """
 
+# pylint: disable=import-outside-toplevel,too-many-lines
+
 import os
+import itertools
+import collections
+import weakref
 import logging
+import operator
+import functools
+import threading
+import types
 from pathlib import Path
 
-from .constants import ENV_CONFIG_NAME, PARENT_CONFIG_TAG, IMPORT_TAG, INCLUDE_TAG
-from ._utils import import_object, load_objects, extract_named_args, try_to_number, parse_args, \
-    get_file_writer, get_file_loader, get_key, evaluate
+from .constants import ENV_CONFIG_NAME, PARENT_CONFIG_TAG, IMPORT_TAG, INCLUDE_TAG, MMAP_THRESHOLD, \
+    PREFETCH_WORKERS, WATCH_INTERVAL, ENV_OVERRIDES_NAME, ENV_OVERRIDE_PREFIX
+from ._snapshot import load_snapshot, save_snapshot
+from ._parallel import load_objects_parallel
+from ._utils import import_object, load_objects, extract_named_args, parse_args, \
+    get_file_writer, get_file_loader, get_file_stream_loader, to_serializable, parse_value, join_path
+from ._paths import compile_path, build_index
+from ._schema import ValidationError, compile_schema
+from ._fingerprint import fingerprint
+from ._profile import LoadStats, profiling_enabled, current, recording, paused, span, bind
 
-__all__ = ['Config']
+__all__ = ['Config', 'clear_file_cache']
 LOG = logging.getLogger('Config')
 
+_MISSING = object()
+_NATIVE_TYPES = (str, int, float, bool, type(None))
+# Exact types of values returned as they are, without loading objects
+_PLAIN_TYPES = frozenset(_NATIVE_TYPES)
+# Reads attributes of a config without going through 'Config.__getattribute__'
+_getattr = object.__getattribute__
+
+# Parsed config documents shared by all Config instances of the process,
+# maps a resolved path to ((path, mtime, size), document).
+_FILE_CACHE = {}
+_FILE_CACHE_LOCK = threading.Lock()
+
+# Configs with cached hashes of their values, see 'clear_fingerprint_cache'
+_HASHING_CONFIGS = weakref.WeakSet()
+
+
+def _resolve_path(cfile, filename):
+    """Returns the path of 'filename' relative to the config file 'cfile'."""
+    return cfile.parent / filename
+
+
+def _read_config(cfile):
+    """Reads and parses a config file.
+
+    Parsed documents are cached by resolved path, modification time and size,
+    so a file shared by several configs is read and parsed once. All configs
+    share the cached document, it must not be modified. Files of at least 'MMAP_THRESHOLD'
+    bytes are parsed from a memory-mapped buffer or stream if the backend
+    supports it, so the file content is not held in memory next to the document.
+    """
+    try:
+        path = str(cfile.resolve())
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        key = None
+
+    if key is not None:
+        with _FILE_CACHE_LOCK:
+            cached_key, document = _FILE_CACHE.get(key[0], (None, None))
+        if cached_key == key:
+            LOG.debug('Use cached config file %s.', cfile)
+            with span('cached', cfile):
+                return document
+
+    stream_loader = None
+    if key is not None and key[2] >= MMAP_THRESHOLD:
+        stream_loader = get_file_stream_loader(cfile.suffix)
+
+    if stream_loader is not None:
+        LOG.debug('Stream large config file %s.', cfile)
+        with span('parse', cfile), open(cfile, 'rb') as file:
+            document = stream_loader(file)
+    else:
+        loader = get_file_loader(cfile.suffix)
+        with span('read', cfile), open(cfile, encoding='utf-8') as file:
+            text = file.read()
+        with span('parse', cfile):
+            document = loader(text)
+
+    if key is not None:
+        with _FILE_CACHE_LOCK:
+            _FILE_CACHE[key[0]] = (key, document)
+    return document
+
+
+def _find_references(document, cfile, includes=True):
+    """Returns the paths of the parent and included config files referenced by a document."""
+    references = []
+    if isinstance(document, dict) and document.get(PARENT_CONFIG_TAG) is not None:
+        references.append(_resolve_path(cfile, document[PARENT_CONFIG_TAG]))
+
+    stack = [document] if includes else []
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(reversed(list(value.values())))
+        elif isinstance(value, list):
+            stack.extend(reversed(value))
+        elif isinstance(value, str) and INCLUDE_TAG in value and IMPORT_TAG not in value:
+            references.append(_resolve_path(cfile, value[len(INCLUDE_TAG):]))
+
+    return references
+
+
+def _prefetch(cfile, max_workers=PREFETCH_WORKERS, includes=True):
+    """Reads and parses a config file and all files it references concurrently.
+
+    The parsed documents are stored in the file cache, so loading the config
+    afterwards does not have to read any file. Errors are ignored, they are
+    raised again when the config is loaded.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        _prefetch_files(pool, bind(_read_config), cfile, includes)
+
+
+def _prefetch_files(pool, read_config, cfile, includes):
+    """Reads 'cfile' in the executor 'pool' and every referenced file as soon as the
+    file referencing it is parsed."""
+    from concurrent.futures import wait, FIRST_COMPLETED
+
+    seen = {str(cfile.resolve())}
+    pending = {pool.submit(read_config, cfile): cfile}
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            path = pending.pop(future)
+            for reference in _unseen_references(future, path, seen, includes):
+                pending[pool.submit(read_config, reference)] = reference
+
+
+def _unseen_references(future, cfile, seen, includes):
+    """Returns the existing files referenced by the document of a finished read, which
+    are not in 'seen', and adds them to 'seen'."""
+    try:
+        document = future.result()
+    except Exception:  # pylint: disable=broad-except
+        LOG.debug('Unable to prefetch config file %s.', cfile, exc_info=True)
+        return []
+
+    references = []
+    for reference in _find_references(document, cfile, includes=includes):
+        resolved = str(reference.resolve())
+        if resolved not in seen and reference.exists():
+            seen.add(resolved)
+            references.append(reference)
+    return references
+
+
+def _running_loop():
+    """Returns the event loop of the running coroutine."""
+    import asyncio
+
+    # 'get_running_loop' is new in Python 3.7, in a coroutine 'get_event_loop' returns the running loop
+    return getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)()
+
+
+async def _aprefetch(cfile, includes=True):
+    """Reads and parses a config file and all files it references without blocking
+    the event loop. Files referenced by the same document are read concurrently."""
+    import asyncio
+
+    loop = _running_loop()
+    seen = {os.path.abspath(cfile)}
+    paths = [cfile]
+    while paths:
+        reads = [loop.run_in_executor(None, _read_config, path) for path in paths]
+        documents = await asyncio.gather(*reads, return_exceptions=True)
+
+        references = []
+        for path, document in zip(paths, documents):
+            if isinstance(document, Exception):
+                LOG.debug('Unable to prefetch config file %s.', path, exc_info=document)
+                continue
+
+            for reference in _find_references(document, path, includes=includes):
+                if os.path.abspath(reference) not in seen:
+                    seen.add(os.path.abspath(reference))
+                    references.append(reference)
+        paths = references
+
+
+def clear_file_cache():
+    """Drops all parsed config documents cached by the process."""
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE.clear()
+
+
+def clear_fingerprint_cache():
+    """Drops the hashes of config values cached by all configs, see 'Config.fingerprint'."""
+    # pylint: disable=protected-access
+    for cfg in list(_HASHING_CONFIGS):
+        with cfg._lock:
+            # variants look hashes up in the caches of their config
+            for hashes in cfg._hashes.maps:
+                hashes.clear()
+            cfg._fingerprint = None
+
+
+def _locate_config_file(filename=None, cli=True):
+    """Returns the path of the config file and the parsed commandline arguments."""
+    if filename is None:
+        args, override_args = parse_args(expect_file=True) if cli else (None, None)
+        cfile = args.config if args is not None else None
+
+        if cfile:
+            LOG.debug('Load config from file %s, specified in CLI argument.', cfile)
+        elif cli:
+            cfile = os.getenv(ENV_CONFIG_NAME, None)
+
+        if cfile:
+            LOG.debug('Load config from file %s, specified in environment variable.', cfile)
+        else:
+            cfile = Path('.', 'configs', 'config.json')
+            LOG.debug('Load config from file from fallback path.')
+    else:
+        LOG.debug('Load config from file %s, specified in parameter.', filename)
+        args, override_args = parse_args(expect_file=False) if cli else (None, None)
+        cfile = filename
+
+    return Path(cfile), args, override_args
+
+
+def _merge_overrides(merged, overrides):
+    """Adds 'overrides' to the dictionary 'merged'. Overridden keys are moved to the
+    end, so they are applied after all other paths, i.e. also after longer paths."""
+    for name, value in overrides.items():
+        merged.pop(name, None)
+        merged[name] = value
+    return merged
+
+
+def _commandline_overrides(override_args):
+    """Returns the overrides of the commandline, e.g. '--model.lr 0.1', with parsed values."""
+    overrides = {}
+    for key, val in extract_named_args(override_args or []).items():
+        name = key[2:] if '--' in key else key  # remove leading --
+        overrides[name] = parse_value(val)
+    return overrides
+
+
+def _environment_overrides(environ, prefix=ENV_OVERRIDE_PREFIX):
+    """Returns the overrides of environment variables, e.g. 'CFG__model__lr=0.1', with parsed values."""
+    return {name[len(prefix):].replace('__', '.'): parse_value(value)
+            for name, value in environ.items() if name.startswith(prefix) and len(name) > len(prefix)}
 
-class Config:
+
+def _file_overrides(filename):
+    """Returns the overrides of a config file mapping dotted paths to values."""
+    overrides = _read_config(Path(filename))
+    if not isinstance(overrides, dict):
+        ex = ValueError(f'Overrides file {filename} does not contain a dictionary!')
+        LOG.exception(ex)
+        raise ex
+    return overrides
+
+
+def _collect_overrides(override_args=None, overrides=None, overrides_file=None, environment=False):
+    """
+    Returns the overrides of all sources merged into one dictionary. Later sources
+    take precedence: the overrides file, environment variables, the commandline and
+    the 'overrides' argument.
+
+    :param override_args: Unparsed commandline arguments
+    :param overrides: Dictionary mapping dotted paths to values
+    :param overrides_file: Path of an overrides file; if None and 'environment' is set,
+                            the file of the environment variable 'CONFIG_OVERRIDES' is used
+    :param environment: If True, read overrides from the environment
+    """
+    merged = {}
+    if overrides_file is None and environment:
+        overrides_file = os.getenv(ENV_OVERRIDES_NAME)
+    if overrides_file:
+        LOG.debug('Load overrides from file %s.', overrides_file)
+        _merge_overrides(merged, _file_overrides(overrides_file))
+    if environment:
+        _merge_overrides(merged, _environment_overrides(os.environ))
+    _merge_overrides(merged, _commandline_overrides(override_args))
+    return _merge_overrides(merged, overrides or {})
+
+
+def _stamp(path):
+    """Returns the modification time and size of a file or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _merge_changes(old, new, path, changed):
+    """Returns 'new', but reuses every subtree of 'old' that equals the corresponding
+    subtree of 'new'. The paths of all changed values are appended to 'changed'."""
+    num_changed = len(changed)
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed.extend(join_path(path, key) for key in old if key not in new)
+        merged = {}
+        for key, value in new.items():
+            if key in old:
+                merged[key] = _merge_changes(old[key], value, join_path(path, key), changed)
+            else:
+                changed.append(join_path(path, key))
+                merged[key] = value
+        return old if len(changed) == num_changed else merged
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        merged = [_merge_changes(o, n, join_path(path, i), changed) for i, (o, n) in enumerate(zip(old, new))]
+        return old if len(changed) == num_changed else merged
+
+    if type(old) is type(new) and old == new:  # pylint: disable=unidiomatic-typecheck
+        return old
+
+    changed.append(path)
+    return new
+
+
+def _import_name(value):
+    """Returns the dotted name of a class, function or module, if it imports the same object, or None."""
+    if isinstance(value, types.ModuleType):
+        name = value.__name__
+    else:
+        module, qualname = getattr(value, '__module__', None), getattr(value, '__qualname__', None)
+        if not isinstance(module, str) or not isinstance(qualname, str) or '<' in qualname:
+            return None
+        name = f'{module}.{qualname}'
+
+    try:
+        return name if import_object(name) is value else None
+    except (ImportError, AttributeError):
+        return None
+
+
+def _import_tag(value, imports):
+    """Returns the import tag of an imported object or None, e.g. 'import::collections.OrderedDict'.
+
+    :param imports: Imported objects by id, mapped to the object and its import tag
+    """
+    if id(value) in imports and imports[id(value)][0] is value:
+        return imports[id(value)][1]
+
+    name = _import_name(value)
+    return None if name is None else IMPORT_TAG + name
+
+
+def _import_encoder(imports):
+    """Returns a function replacing imported objects by their import tags, e.g. for 'get_file_writer'.
+
+    :param imports: Imported objects by id, mapped to the object and its import tag
+    """
+    def default(value):
+        tag = _import_tag(value, imports)
+        if tag is None:
+            raise TypeError(f'Unable to save {type(value).__name__} object, only imported objects can be saved.')
+        return tag
+    return default
+
+
+def _profiled(method):
+    """Records the spans of a method into the statistics of the config, if it is profiled."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # pylint: disable=protected-access
+        stats = self._stats
+        if stats is None or current() is stats:
+            return method(self, *args, **kwargs)
+        with recording(stats):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _make_key(instance, args, kwargs):
+    """Returns a hashable cache key for the call arguments or None if they are not hashable."""
+    key = (instance, args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        LOG.debug('Arguments are not hashable, skip object cache.')
+        return None
+    return key
+
+
+class Config:  # pylint: disable=too-many-instance-attributes
     """Config object from json/json5 or yaml file.
 
     Filename can be provided via constructor argument, commandline argument
@@ -62,83 +442,239 @@ class Config:
     Parameter can recursively contain other object definitions.
     """
 
-    def __init__(self, filename: str = None):
+    # Names resolved as regular attributes, all other names are config values.
+    # Precomputed per class, so attribute access never has to call 'dir'.
+    _reserved = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._reserved = frozenset(dir(cls))
+
+    # Internal state is kept in slots, so '__dict__' only holds config values.
+    # Each slot is read on hot paths, grouping them would add a lookup per access.
+    __slots__ = ('__dict__', '__weakref__', '_cache_objects', '_instances', '_lazy', '_unresolved', '_sources',
+                 '_options', '_lock', '_callbacks', '_watcher', '_index',
+                 '_stats', '_imports', '_hashes', '_fingerprint')
+
+    def __init__(self, filename: str = None, cache: bool = False, lazy: bool = False, cli: bool = True, *,
+                 snapshot: bool = False, prefetch=False, profile: bool = None, overrides: dict = None,
+                 overrides_file: str = None, schema=None):
         """Create config object from json/json5 or yaml file.
 
         :param filename: optional;
             If passed read config from specified file.
+        :param cache: optional;
+            Default for 'get(..., cache=None)', attribute and item access.
+            If True, loaded objects are cached and reused on later reads.
+        :param lazy: optional;
+            If True, 'import::' and 'include::' values are kept unresolved until
+            the toplevel value containing them is accessed the first time.
+        :param cli: optional;
+            If False, the commandline and environment are ignored, i.e. neither
+            '--config', 'CONFIG_FILE' nor value overrides are read from them. Included
+            configs are always loaded without commandline arguments.
+        :param snapshot: optional;
+            If True, the merged values are stored in a snapshot file next to
+            the config file (see 'SNAPSHOT_SUFFIX'). Later loads read the snapshot
+            instead of the config files, as long as none of them changed.
+            Commandline overrides are not part of the snapshot.
+        :param prefetch: optional;
+            If True or the number of threads, all parent and included files are
+            read and parsed concurrently before merging them. In lazy mode only
+            parent files are prefetched.
+        :param profile: optional;
+            If True, the time of every load stage is recorded, see 'load_stats'.
+            If None, profiling is enabled by the environment variable 'CONFIG_PROFILE'.
+            Configs loaded while another config is profiled, e.g. included
+            configs, record into the statistics of this config, unless they
+            are created with 'profile=False'.
+        :param overrides: optional;
+            Dictionary mapping dotted paths, e.g. 'model.layers.0.units', to their
+            new values. Takes precedence over all other overrides.
+        :param overrides_file: optional;
+            Config file mapping dotted paths to their new values, e.g. for more
+            overrides than fit on the commandline. If None and 'cli' is set, the
+            file of the environment variable 'CONFIG_OVERRIDES' is used.
+        :param schema: optional;
+            If passed, the config is validated after applying the overrides and values
+            are coerced to the types of the schema, see 'validate'. Reloaded configs and
+            variants are validated too.
+
+        Overrides are read from the overrides file, environment variables starting
+        with 'CFG__' (e.g. 'CFG__model__lr=0.1' overrides 'model.lr'), the commandline
+        and the 'overrides' argument, later sources take precedence. The values of the
+        environment and commandline are parsed as literals, see 'parse_value'. All
+        overrides are applied in order after loading the config, every dictionary and
+        list on their paths is copied once.
         """
+        self._init_state(cache, lazy)
+        if profile is not None and not profile:
+            # the spans are not recorded into the statistics of a config loading this config
+            context = paused()
+        else:
+            self._stats = current()
+            if self._stats is None and profiling_enabled(profile):
+                self._stats = LoadStats()
+            context = recording(self._stats)
 
-        if filename is None:
-            args, override_args = parse_args(expect_file=True)
-            cfile = args.config
+        with context:
+            cfile, _, override_args = _locate_config_file(filename, cli)
+            overrides = _collect_overrides(override_args, overrides, overrides_file, environment=cli)
+            # the overrides are kept to apply them again on 'reload'
+            self._options = (cfile, overrides, schema)
+            if not (snapshot and self._load_snapshot(cfile)):
+                if prefetch:
+                    max_workers = PREFETCH_WORKERS if prefetch is True else prefetch
+                    with span('prefetch', cfile):
+                        _prefetch(cfile, max_workers=max_workers, includes=not lazy)
+                self._load_config_file(cfile, snapshot=snapshot)
+            self._apply_overrides(overrides, cfile)
+            if schema is not None:
+                # methods are called through the class, config values of the same name
+                # hide them on the instance
+                type(self).validate(self, schema)
 
-            if cfile:
-                LOG.debug('Load config from file %s, specified in CLI argument.', cfile)
-            else:
-                cfile = os.getenv(ENV_CONFIG_NAME, None)
+    def _init_state(self, cache, lazy):
+        self._cache_objects = cache
+        self._instances = {}
+        self._lazy = lazy
+        self._unresolved = {}
+        # Files the values were loaded from, mapped to their modification time and size
+        self._sources = {}
+        self._options = None
+        self._lock = threading.RLock()
+        self._callbacks = []
+        self._watcher = None
+        # Path index per toplevel value, see 'at'
+        self._index = {}
+        self._stats = None
+        # Imported objects by id, mapped to the object and its import tag, see 'save_to'
+        self._imports = {}
+        # Hashed containers by id, mapped to the container, its hash and nested containers, see
+        # 'fingerprint'. Copies made by 'with_overrides' fall back to the hashes of their config.
+        self._hashes = collections.ChainMap()
+        # Toplevel names and values of the last hash of all values, and the hash, see 'fingerprint'
+        self._fingerprint = None
 
-            if cfile:
-                LOG.debug('Load config from file %s, specified in environment variable.', cfile)
-            else:
-                cfile = Path('.', 'configs', 'config.json')
-                LOG.debug('Load config from file from fallback path.')
-        else:
-            LOG.debug('Load config from file %s, specified in parameter.', filename)
-            args, override_args = parse_args(expect_file=False)
-            cfile = filename
+    def __getstate__(self):
+        # The lock, the watcher, callbacks and statistics belong to the process and cached
+        # objects and hashes are created again, so configs can be passed to other processes.
+        state = {'cache': self._cache_objects, 'lazy': self._lazy, 'unresolved': self._unresolved,
+                 'sources': self._sources, 'options': self._options, 'imports': list(self._imports.values())}
+        return self.__dict__, state
+
+    def __setstate__(self, state):
+        values, state = state
+        self._init_state(state['cache'], state['lazy'])
+        self.__dict__.update(values)
+        self._unresolved.update(state['unresolved'])
+        self._sources.update(state['sources'])
+        self._options = state['options']
+        # ids of the imported objects differ after unpickling
+        self._imports.update((id(obj), (obj, tag)) for obj, tag in state['imports'])
+
+    @classmethod
+    async def aload(cls, filename: str = None, **kwargs):
+        """Create config object without blocking the running event loop.
+
+        First all parent and included files are read and parsed in the default
+        executor of the loop, files referenced by the same file concurrently.
+        Afterwards the config is created in the executor from the parsed files.
+        The result is the same as 'Config(filename, **kwargs)'.
 
-        self._load_config_file(Path(cfile), args, override_args)
+        :param filename: optional;
+            If passed read config from specified file.
+        :param kwargs: Keyword arguments of the constructor
+        :return: The config object
+        """
+        loop = _running_loop()
+        # locating the file may parse the commandline, which imports argparse
+        cfile, _, _ = await loop.run_in_executor(None, _locate_config_file, filename, kwargs.get('cli', True))
+        await _aprefetch(cfile, includes=not kwargs.get('lazy', False))
+        return await loop.run_in_executor(None, functools.partial(cls, filename, **kwargs))
 
-    def _load_config_file(self, cfile, args=None, override_args=None):
-        # Read config and override with args if passed
+    def _load_config_file(self, cfile, snapshot=False):
         if cfile.exists():
-            loader = get_file_loader(cfile.suffix)
-            with open(cfile) as file:
-                nv_pairs = loader(file.read()).items()
+            self._sources[cfile] = _stamp(cfile)
+            with span('load', cfile):
+                nv_pairs = _read_config(cfile).items()
                 self._initialize_from_nvpairs(nv_pairs, cfile)
 
-            # override if necessary
-            if args is not None:
-                pass
-
-            if override_args is not None:
-                self._override_from_commandline(override_args, cfile=cfile)
+            if snapshot:
+                with span('snapshot', cfile):
+                    save_snapshot(cfile, self.__dict__, self._unresolved, self._sources, self._imports.values(),
+                                  lazy=self._lazy)
         else:
             ex = IOError(f'Configuration file {cfile} does not exist!')
             LOG.exception(ex)
             raise ex
 
     def _import_value_rec(self, value, cfile):
+        # pylint: disable=protected-access
         if isinstance(value, str) and IMPORT_TAG in value:
             try:
                 LOG.debug('Import object: %s', value[len(IMPORT_TAG):])
-                value = import_object(value[len(IMPORT_TAG):])
+                tag, value = value, import_object(value[len(IMPORT_TAG):])
+                if not isinstance(value, _NATIVE_TYPES):
+                    self._imports[id(value)] = (value, tag)
             except ModuleNotFoundError:
                 LOG.error('Unable to import "%s"', value, exc_info=True)
 
         elif isinstance(value, str) and INCLUDE_TAG in value:
             LOG.debug('Include object: %s', value[len(INCLUDE_TAG):])
-            base_path = Path(value[len(INCLUDE_TAG):]).relative_to(cfile.parent)
-            value = Config(str(base_path)).__dict__
+            base_path = _resolve_path(cfile, value[len(INCLUDE_TAG):])
+            with span('include', base_path):
+                included = Config(str(base_path), cli=False)
+            self._sources.update(included._sources)
+            self._imports.update(included._imports)
+            value = included.__dict__
 
         elif isinstance(value, dict):
+            # Copy containers only if a nested value changed, parsed documents are shared
+            resolved = None
             for key, val in value.items():
-                value[key] = self._import_value_rec(val, cfile)
+                new_val = self._import_value_rec(val, cfile)
+                if new_val is not val:
+                    resolved = dict(value) if resolved is None else resolved
+                    resolved[key] = new_val
+            value = value if resolved is None else resolved
 
         elif isinstance(value, list):
+            resolved = None
             for i, val in enumerate(value):
-                value[i] = self._import_value_rec(val, cfile)
+                new_val = self._import_value_rec(val, cfile)
+                if new_val is not val:
+                    resolved = list(value) if resolved is None else resolved
+                    resolved[i] = new_val
+            value = value if resolved is None else resolved
 
         return value
 
+    def _load_snapshot(self, cfile):
+        with span('snapshot', cfile):
+            state = load_snapshot(cfile, lazy=self._lazy)
+        if state is None:
+            return False
+
+        self.__dict__.update(state['values'])
+        self._unresolved.update(state['unresolved'])
+        self._sources.update(state['sources'])
+        # ids of the imported objects differ after unpickling
+        self._imports.update((id(obj), (obj, tag)) for obj, tag in state['imports'])
+        return True
+
     def _set_attribute(self, name, value, cfile):
         if value is not None:
-            value = self._import_value_rec(value, cfile)
+            self._instances.pop(name, None)
+            self._index.pop(name, None)
+            if self._lazy:
+                self._unresolved[name] = cfile
+            else:
+                value = self._import_value_rec(value, cfile)
             setattr(self, name, value)
             LOG.debug('CONFIG: %s=%s', name, value)
 
-    def get(self, name, *args, default=None, instance=True, dictionary=None, **kwargs):
+    def get(self, name, *args, default=None, instance=True, dictionary=None, cache=None, parallel=None, **kwargs):
         """
         Loads a value from the config. If the value contains a class specification,
         the object will be loaded.
@@ -148,98 +684,537 @@ class Config:
         :param instance: If false a class will just be imported but not instantiated
         :param dictionary: Dictionary to searche for 'name'. If not provided the
                             Config toplevel is used
+        :param cache: If True, reuse the value loaded by a previous call with the same
+                            arguments. If None, the 'cache' setting of the Config is used.
+                            Only toplevel values are cached.
+        :param parallel: If True, the number of threads or an executor, independent objects
+                            are created in parallel. Objects are still created after the
+                            objects in their parameters. Failures raise an 'InstantiationError'
+                            listing the path of every failed object.
         :param args: Positional arguments to instantiate objects
         :param kwargs: Keyword arguments to instantiate objects
                             (override config file values)
         :return: A configuration value for 'name'
         """
+        if dictionary is not None:
+            if name not in dictionary:
+                return default
+            return self._load_value(name, dictionary.get(name), args, kwargs, instance=instance, parallel=parallel)
+
+        # pylint: disable=protected-access
+        # internal state is read with '_getattr', this is the hot path of attribute access
+        dictionary = _getattr(self, '__dict__')
+        value = dictionary.get(name, _MISSING)
+        if value is _MISSING:
+            return default
+
+        cls = type(self)
+        if name in _getattr(self, '_unresolved'):
+            cls._resolve(self, name)
+            value = dictionary[name]
+        elif type(value) in _PLAIN_TYPES:
+            return value
+
+        if cache is None:
+            cache = _getattr(self, '_cache_objects')
+
+        key = _make_key(instance, args, kwargs) if cache else None
+        if key is None:
+            return cls._load_value(self, name, value, args, kwargs, instance=instance, parallel=parallel)
+
+        instances = _getattr(self, '_instances').setdefault(name, {})
+        if key not in instances:
+            instances[key] = cls._load_value(self, name, value, args, kwargs, instance=instance, parallel=parallel)
+        return instances[key]
+
+    def _load_value(self, name, value, args, kwargs, *, instance, parallel):
+        stats = _getattr(self, '_stats')
+        if stats is not None and current() is not stats:
+            with recording(stats):
+                return type(self)._load_value(self, name, value, args, kwargs, instance=instance, parallel=parallel)
+
+        if parallel and instance:
+            return load_objects_parallel(value, args, kwargs, parallel=parallel, path=name)
+        return load_objects(value, *args, instance=instance, **kwargs)
+
+    def at(self, path, *args, default=None, instance=True, **kwargs):  # pylint: disable=invalid-name
+        """
+        Loads a nested value from the config, like 'get' for toplevel values.
+
+        The first lookup of a path in a toplevel value builds an index of all
+        paths in this value, so later lookups do not have to walk the config.
+        Paths can be compiled once with 'compile_path' to avoid parsing them
+        on every call.
+
+        :param path: Dotted path of the value, e.g. 'model.layers.3.units',
+                            or a compiled path
+        :param default: Default value if 'path' was not found
+        :param instance: If false a class will just be imported but not instantiated
+        :param args: Positional arguments to instantiate objects
+        :param kwargs: Keyword arguments to instantiate objects
+                            (override config file values)
+        :return: A configuration value for 'path'
+        """
+        path = compile_path(path)
+        name = path.keys[0]
+        if name not in self.__dict__:
+            return default
+
+        if name in self._unresolved:
+            self._resolve(name)
+
+        index = self._index.get(name)
+        if index is None:
+            index = self._index[name] = build_index(name, self.__dict__[name])
+
+        value = index.get(path.path, _MISSING)
+        if value is _MISSING:
+            # e.g. list indices with leading zeros
+            value = path.lookup(self.__dict__[name], default=_MISSING, start=1)
+            if value is _MISSING:
+                return default
+
+        return load_objects(value, *args, instance=instance, **kwargs)
+
+    def iter(self, name, *args, instance=True, dictionary=None, **kwargs):
+        """
+        Iterates over a list value of the config. Items are loaded one at a time,
+        when they are requested, instead of loading the whole list at once.
+
+        :param name: Name of the list value to iterate
+        :param instance: If false a class will just be imported but not instantiated
+        :param dictionary: Dictionary to searche for 'name'. If not provided the
+                            Config toplevel is used
+        :param args: Positional arguments to instantiate objects
+        :param kwargs: Keyword arguments to instantiate objects
+                            (override config file values)
+        :return: Iterator over the loaded items of 'name'
+        """
         if dictionary is None:
             dictionary = self.__dict__
+            if name in self._unresolved:
+                self._resolve(name)
 
         if name not in dictionary:
-            return default
+            raise KeyError(name)
+
+        value = dictionary[name]
+        if not isinstance(value, list):
+            raise TypeError(f"Config value '{name}' is not a list")
+
+        return (load_objects(item, *args, instance=instance, **kwargs) for item in value)
+
+    @_profiled
+    def _resolve(self, name):
+        """Resolves imports and includes of a value loaded in lazy mode."""
+        cfile = self._unresolved.get(name, _MISSING)
+        if cfile is _MISSING:
+            return
+
+        LOG.debug('Resolve lazy value: %s', name)
+        with span('resolve', name):
+            self.__dict__[name] = self._import_value_rec(self.__dict__[name], cfile)
+        self._index.pop(name, None)
+        self._unresolved.pop(name, None)
+
+    def clear_cache(self, name=None):
+        """Drops cached objects.
+
+        :param name: optional;
+            If passed only drop the objects cached for this value.
+        """
+        if name is None:
+            self._instances.clear()
+        else:
+            self._instances.pop(name, None)
+
+    @_profiled
+    def reload(self):
+        """Reloads the config if any of its files changed.
+
+        Only changed files are parsed again, but all files are merged again and the
+        result is compared to the current values, so a reload takes about as long as
+        loading the config from already parsed files. Changed values replace the current
+        values, unchanged parts of the config are kept. Cached objects are dropped
+        for changed toplevel values only. Registered callbacks (see 'watch') are
+        called with the config and the list of changed paths.
+
+        :return: Dotted paths of all changed values
+        """
+        # pylint: disable=protected-access
+        with self._lock:
+            if self._options is None or all(_stamp(path) == stamp for path, stamp in self._sources.items()):
+                return []
+
+            cfile, overrides, schema = self._options
+            LOG.debug('Reload config from file %s.', cfile)
+            fresh = object.__new__(type(self))
+            fresh._init_state(cache=False, lazy=self._lazy)
+            fresh._stats = self._stats
+            with span('reload', cfile):
+                fresh._load_config_file(cfile)
+                fresh._apply_overrides(overrides, cfile)
+                if schema is not None:
+                    type(fresh).validate(fresh, schema)
+
+            changed = []
+            for name in [name for name in self.__dict__ if name not in fresh.__dict__]:
+                changed.append(name)
+                del self.__dict__[name]
+                self._unresolved.pop(name, None)
+                type(self).clear_cache(self, name)
+
+            # values resolved in this config are compared resolved
+            for name in [name for name in fresh._unresolved if name in self.__dict__ and name not in self._unresolved]:
+                fresh._resolve(name)
+
+            for name, value in fresh.__dict__.items():
+                num_changed = len(changed)
+                self.__dict__[name] = _merge_changes(self.__dict__.get(name, _MISSING), value, name, changed)
+                if len(changed) != num_changed:
+                    type(self).clear_cache(self, name)
+                    self._unresolved.pop(name, None)
+                    if name in fresh._unresolved:
+                        self._unresolved[name] = fresh._unresolved[name]
+
+            self._sources = dict(fresh._sources)
+            self._imports.update(fresh._imports)
+            self._index.clear()
+            callbacks = list(self._callbacks)
+
+        if changed:
+            LOG.debug('Changed config values: %s', ', '.join(changed))
+            for callback in callbacks:
+                callback(self, changed)
+        return changed
+
+    @_profiled
+    def validate(self, schema=None, coerce=True, check_params=True):
+        """
+        Validates the config against a schema in a single pass over all values and
+        replaces values by their coerced values. Unresolved values of a config in
+        lazy mode are resolved first.
 
-        val = dictionary.get(name)
-        return load_objects(val, *args, instance=instance, **kwargs)
+        Schemas can be types and 'typing' types, dictionaries mapping keys to schemas,
+        lists with an item schema, dataclasses, annotated classes or JSON Schema
+        dictionaries, e.g. {'model': {'lr': float, 'layers': [int]}, 'name': Optional[str]}.
+        Compiled schemas are cached, so they must not be modified after they were used.
+
+        :param schema: The schema of the toplevel values; if None only the parameters
+                            of objects are checked
+        :param coerce: If True, values are converted to the type of the schema if
+                            possible, e.g. '1e-3' or 1 to a float for 'float'
+        :param check_params: If True, the parameters of all objects are checked against
+                            the signature of their class and its annotations
+        :raises ValidationError: With the dotted path and message of every error
+        """
+        validator = compile_schema(schema, coerce=coerce, check_params=check_params)
+        for name in list(self._unresolved):
+            self._resolve(name)
+
+        errors = {}
+        with span('validate'):
+            values = validator(self.__dict__, '', errors)
+        if errors:
+            ex = ValidationError(errors)
+            LOG.error(ex)
+            raise ex
+
+        for name, value in values.items():
+            if value is not self.__dict__[name]:
+                type(self).clear_cache(self, name)
+                self._index.pop(name, None)
+                self.__dict__[name] = value
+
+    def fingerprint(self, subtree=None):
+        """
+        Returns a stable hash of the config values, e.g. to key cached datasets or
+        checkpoints on the config. Unresolved values of a config in lazy mode are
+        resolved first.
+
+        The hash depends on the merged values only, e.g. not on the files they were
+        loaded from or the order of keys. Imported objects and the classes of objects
+        are hashed by their dotted name as written in the config. Hashes of nested values are cached by the
+        config and used by configs created by 'with_overrides', so only overridden
+        values are hashed again. Hashing all values drops the hashes of replaced values.
+
+        :param subtree: optional;
+            Dotted path of the value to hash, e.g. 'model'. By default all values are hashed.
+        :return: SHA-256 hash as hex string
+        :raises KeyError: If 'subtree' is not in the config
+        :raises TypeError: If a value can not be hashed, e.g. an object passed as override
+        """
+        _HASHING_CONFIGS.add(self)
+        if subtree is None:
+            for name in list(self._unresolved):
+                self._resolve(name)
+            with self._lock:
+                # '__dict__' is modified in place when values are set, so its hash is reused
+                # only if it still contains the same values
+                names, values = list(self.__dict__), list(self.__dict__.values())
+                cached = self._fingerprint
+                if cached is None or cached[0] != names or not all(map(operator.is_, cached[1], values)):
+                    # only the hashes of current values are kept
+                    hashes = {}
+                    digest = fingerprint(self.__dict__, self._hash_name, hashes, self._hashes.maps, memoize=False)
+                    self._hashes = collections.ChainMap(hashes)
+                    cached = self._fingerprint = (names, values, digest)
+                return cached[2]
+
+        path = compile_path(subtree)
+        if path.keys[0] in self._unresolved:
+            self._resolve(path.keys[0])
+        value = path.lookup(self.__dict__, default=_MISSING)
+        if value is _MISSING:
+            raise KeyError(subtree)
+        with self._lock:
+            return fingerprint(value, self._hash_name, self._hashes.maps[0], self._hashes.maps[1:])
+
+    def _hash_name(self, value):
+        # the name as written in the config, so the hash does not change if the object is moved
+        tag = _import_tag(value, self._imports)
+        return None if tag is None else tag[len(IMPORT_TAG):]
+
+    def load_stats(self):
+        """
+        Returns the timings recorded while loading the config or None if it
+        is not profiled (see the 'profile' argument).
+
+        The statistics contain an event per stage of a file or object, e.g.
+        'read', 'parse', 'load', 'parent', 'include', 'import', 'instantiate'
+        or 'override'. Objects created by 'get' are recorded as well. Use
+        'stages()' or 'names()' for a summary, 'to_dict()' for a structured report
+        and 'save(filename, format='chrome')' to export a Chrome trace.
+        """
+        return self._stats
+
+    def watch(self, callback=None, interval=WATCH_INTERVAL):
+        """Watches the files of the config and reloads it if any file changes.
+
+        Files are polled in a background thread every 'interval' seconds, i.e. changes
+        are noticed with a delay of up to 'interval' seconds and every poll checks the
+        size and modification time of all files of the config.
+
+        :param callback: optional;
+            Function called with the config and the list of changed paths after
+            every reload changing the config.
+        :param interval: optional;
+            Seconds between two checks for changed files.
+        """
+        if callback is not None:
+            self._callbacks.append(callback)
+
+        with self._lock:
+            if self._watcher is None:
+                stop = threading.Event()
+                thread = threading.Thread(target=Config._watch, args=(weakref.ref(self), stop, interval),
+                                          name='ConfigWatcher', daemon=True)
+                self._watcher = (thread, stop)
+                thread.start()
+
+    def unwatch(self):
+        """Stops watching the files of the config and removes all callbacks."""
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+            self._callbacks.clear()
+
+        if watcher is not None:
+            thread, stop = watcher
+            stop.set()
+            if thread is not threading.current_thread():
+                thread.join()
+
+    @staticmethod
+    def _watch(ref, stop, interval):
+        while not stop.wait(interval):
+            config = ref()
+            if config is None:
+                return
+
+            try:
+                type(config).reload(config)
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception('Unable to reload config.')
+            del config
 
     def __getitem__(self, item):
-        value = self.get(item)
-        if value:
-            return value
+        value = type(self).get(self, item, default=_MISSING)
+        if value is _MISSING:
+            raise KeyError(item)
 
-        raise KeyError
+        return value
 
     def __getattribute__(self, item):
-        if item not in dir(Config):
-            value = self.get(item)
-            if value:
-                return value
+        cls = type(self)
+        if item in cls._reserved:
+            return _getattr(self, item)
+
+        # plain values are returned without calling 'get'
+        value = _getattr(self, '__dict__').get(item, _MISSING)
+        if type(value) in _PLAIN_TYPES and item not in _getattr(self, '_unresolved'):
+            return value
 
-            raise AttributeError
+        value = cls.get(self, item, default=_MISSING)
+        if value is _MISSING:
+            raise AttributeError(f"'{type(self).__name__}' has no config value '{item}'")
 
-        return object.__getattribute__(self, item)
+        return value
 
     def _initialize_from_nvpairs(self, nv_pairs=None, cfile=None):
         if nv_pairs:
             for name, value in nv_pairs:
                 if PARENT_CONFIG_TAG == name and value is not None:
-                    base_path = Path(value).relative_to(cfile.parent)
+                    base_path = _resolve_path(cfile, value)
                     LOG.debug('Load parent config: %s', base_path)
-                    self._load_config_file(base_path)
+                    with span('parent', base_path):
+                        self._load_config_file(base_path)
                 else:
                     self._set_attribute(name, value, cfile)
 
-    def _override_from_commandline(self, override_args=None, cfile=None):
-        if override_args is None:
+    @_profiled
+    def _apply_overrides(self, overrides, cfile=None):
+        if not overrides:
             return
 
-        override = extract_named_args(override_args)
-        for key, val in override.items():
-            name = key[2:] if '--' in key else key  # remove leading --
-            value = val if val is None or val.startswith('"') or val.startswith("'") else try_to_number(val)
+        # Paths are grouped by their toplevel value and set in order, every toplevel value is
+        # prepared once and every container on the paths is copied once
+        paths = {}
+        for name, value in overrides.items():
             LOG.debug('Override key "%s" with value "%s"', name, value)
+            path = compile_path(name)
+            paths.setdefault(path.keys[0], []).append((path, value))
 
-            value = evaluate(value)
+        for toplevel, values in paths.items():
+            with span('override', toplevel):
+                type(self).clear_cache(self, toplevel)
+                self._resolve(toplevel)
+                self._index.pop(toplevel, None)
+                # Values may be shared with other configs, so only copy the containers along the paths
+                owned = {}
+                for path, value in values:
+                    if len(path) == 1:
+                        self._set_attribute(toplevel, value, cfile)
+                    else:
+                        self.__dict__[toplevel] = path.replace(self.__dict__.get(toplevel), value, 1, owned)
 
-            current = self.__dict__
-            names = name.split('.')
+    def _clone(self):
+        # pylint: disable=protected-access
+        clone = object.__new__(type(self))
+        clone._init_state(self._cache_objects, self._lazy)
+        clone.__dict__.update(self.__dict__)
+        clone._unresolved.update(self._unresolved)
+        clone._sources.update(self._sources)
+        clone._imports.update(self._imports)
+        # the copy looks hashes up in the caches of the config, empty caches are skipped
+        clone._hashes = collections.ChainMap({}, *(hashes for hashes in self._hashes.maps if hashes))
+        clone._options = self._options
+        clone._stats = self._stats
+        return clone
 
-            if len(names) == 1:
-                self._set_attribute(names[0], value, cfile)
-                continue
+    def with_overrides(self, overrides):
+        """Returns a copy of the config with overridden values.
 
-            for i, cur_key in enumerate(names):
-                last = i == len(names)-1
-                idx = get_key(current, cur_key)
+        The config is not modified and the copy shares all values not on the
+        path of an overridden value. Paths are handled like commandline
+        overrides, e.g. missing dictionaries and lists are created, but values
+        are used as they are.
 
-                if idx is None and not last:
-                    new_current = {}
-                    idx = cur_key
-                    if isinstance(try_to_number(names[i + 1]), int):
-                        new_current = []
+        :param overrides: Dictionary mapping dotted paths, e.g. 'model.layers.0.units',
+                            to their new values
+        :return: The new config
+        """
+        # pylint: disable=protected-access
+        variant = self._clone()
+        cfile, schema = None, None
+        if variant._options is not None:
+            # keep the overrides to apply them again on 'reload'
+            cfile, previous, schema = variant._options
+            variant._options = (cfile, _merge_overrides(dict(previous), overrides), schema)
 
-                    if i == 0:
-                        self._set_attribute(idx, new_current, cfile)
-                    elif isinstance(current, dict):
-                        current[idx] = new_current
-                    else:
-                        assert isinstance(current, list)
-                        # pylint: disable=no-member
-                        current.append(new_current)
+        variant._apply_overrides(overrides, cfile)
+        if schema is not None:
+            type(variant).validate(variant, schema)
+        return variant
 
-                    current = new_current
-                elif not last:
-                    current = current[idx]
-                else:
-                    idx = try_to_number(cur_key)
-                    current[idx] = value
-
-    def save_to(self, filename):
-        """Saved the current configuration to a file.
-
-        :param file: filename to save the configuration to
-        """""
-        LOG.debug('Safe config to %s', filename)
-        writer = get_file_writer(Path(filename).suffix)
-        with open(filename, 'w') as file:
-            writer(self.__dict__, file, indent=2, sort_keys=True)
+    @classmethod
+    def sweep(cls, base, grid, **kwargs):
+        """Generates a config for every combination of override values.
+
+        The base config is loaded once, all variants are derived from it
+        with 'with_overrides' and share all values which are not overridden.
+
+        :param base: Config or filename of the base config
+        :param grid: Dictionary mapping dotted paths to lists of values
+        :param kwargs: Keyword arguments of the constructor if 'base' is a filename.
+                        The commandline and environment are ignored unless 'cli=True' is passed.
+        :return: Iterator over the configs, the last path changes fastest
+        """
+        if not isinstance(base, Config):
+            kwargs.setdefault('cli', False)
+            base = cls(base, **kwargs)
+
+        names = list(grid)
+        for values in itertools.product(*(grid[name] for name in names)):
+            yield type(base).with_overrides(base, dict(zip(names, values)))
+
+    def save_to(self, filename, delta=False):
+        """Saves the current configuration to a file.
+
+        Unresolved values of a config in lazy mode are resolved first. Imported
+        classes, functions and modules are written as their 'import::' strings,
+        so the saved file loads the same objects again. Other objects, e.g. objects
+        passed as override values, can not be saved. The values are written by the
+        streaming writer of the file format.
+
+        :param filename: filename to save the configuration to
+        :param delta: optional;
+            If True, only the toplevel values which differ from the values of the
+            config file and its parent files are written, together with a 'parent'
+            tag referencing the config file, e.g. to store the overrides of a run.
+            Loading the saved file gives the same config.
+        """
+        LOG.debug('Save config to %s', filename)
+        for name in list(self._unresolved):
+            self._resolve(name)
+
+        data = self.__dict__
+        if delta:
+            # the parent tag has to come first, values after it override the values of the parent
+            data = self._delta(Path(filename))
+
+        writer = get_file_writer(Path(filename).suffix, default=_import_encoder(self._imports))
+        with open(filename, 'w', encoding='utf-8') as file:
+            writer(data, file, indent=2, sort_keys=not delta)
+
+    def _delta(self, path):
+        """Returns a parent tag referencing the config file relative to 'path',
+        followed by the sorted toplevel values differing from the config file."""
+        # pylint: disable=protected-access
+        if self._options is None:
+            raise ValueError('Unable to save the differences of a config without config file!')
+
+        cfile = self._options[0]
+        base = Config(str(cfile), cli=False)
+        try:
+            parent = os.path.relpath(Path(cfile).resolve(), path.resolve().parent)
+        except ValueError:
+            # e.g. on different drives
+            parent = str(Path(cfile).resolve())
+
+        default, base_default = _import_encoder(self._imports), _import_encoder(base._imports)
+        data = {PARENT_CONFIG_TAG: parent}
+        for name, value in sorted(self.__dict__.items()):
+            base_value = base.__dict__.get(name, _MISSING)
+            if value is base_value:
+                continue
+
+            changed = []
+            if base_value is not _MISSING:
+                _merge_changes(to_serializable(base_value, base_default), to_serializable(value, default), name,
+                               changed)
+            if base_value is _MISSING or changed:
+                data[name] = value
+        return data
+
+
+Config._reserved = frozenset(dir(Config))  # pylint: disable=protected-access
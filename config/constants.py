@@ -15,6 +15,9 @@ Version  Date        Author             Description
 """
 
 ENV_CONFIG_NAME = 'CONFIG_FILE'
+ENV_PROFILE_NAME = 'CONFIG_PROFILE'
+ENV_OVERRIDES_NAME = 'CONFIG_OVERRIDES'
+ENV_OVERRIDE_PREFIX = 'CFG__'
 PARENT_CONFIG_TAG = 'parent'
 INCLUDE_TAG = 'include::'
 IMPORT_TAG = 'import::'
@@ -22,3 +25,11 @@ CLASS_TAG = 'class'
 OBJECT_PARM_TAG = 'params'
 
 CONFIG_ARG_TAG = '--config'
+
+IMPORT_CACHE_SIZE = 1024
+SNAPSHOT_SUFFIX = '.snapshot'
+MMAP_THRESHOLD = 8 * 2 ** 20
+PREFETCH_WORKERS = 8
+WATCH_INTERVAL = 1.0
+PATH_CACHE_SIZE = 4096
+SCHEMA_CACHE_SIZE = 256
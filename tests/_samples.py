@@ -79,6 +79,15 @@ _TARGET_05 = {
                  Dummy(1, 2, 3)]}
 }
 
+_SAMPLE_06 = {
+    'a': 0,
+    'b': [],
+    'c': {},
+    'd': False
+}
+
+_TARGET_06 = copy.deepcopy(_SAMPLE_06)
+
 SAMPLE_COLLECTION = {
     'SAMPLE_01':       (_SAMPLE_01, _TARGET_01),
     'SAMPLE_02':       (_SAMPLE_02, _TARGET_02),
@@ -86,6 +95,7 @@ SAMPLE_COLLECTION = {
     'SAMPLE_04':       (_SAMPLE_04, _TARGET_04),
     'sample_04_inc01': (_sample_04_inc01, ),
     'SAMPLE_05':       (_SAMPLE_05, _TARGET_05),
+    'SAMPLE_06':       (_SAMPLE_06, _TARGET_06),
 }
 
 
@@ -16,10 +16,12 @@ Version  Date        Author             Description
 
 import io
 import json
+import time
+import threading
 from unittest.mock import MagicMock
 
 
-__all__ = ['Dummy', 'get_config_mock']
+__all__ = ['Dummy', 'Slow', 'Failing', 'get_config_mock']
 
 
 class Dummy:
@@ -28,6 +30,19 @@ class Dummy:
         self.kwargs = kwargs
 
 
+class Slow(Dummy):
+    def __init__(self, *args, delay=0.1, **kwargs):
+        super().__init__(*args, **kwargs)
+        time.sleep(delay)
+        self.thread = threading.current_thread()
+
+
+class Failing(Dummy):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        raise ValueError('Failing object')
+
+
 class MMock:
     def __init__(self, fnc):
         self.fnc = fnc
@@ -0,0 +1,18 @@
+"""__init__.py: Micro benchmarks for the config tool.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Micro benchmarks for the config tool. The benchmark modules are named
+```bench_*.py```, so they are not collected by pytest. Run a benchmark with
+```python -m tests.benchmark.bench_<name>```. ```bench_suite``` runs the main
+load and access benchmarks and compares them to stored baselines.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
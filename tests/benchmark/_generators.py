@@ -0,0 +1,78 @@
+"""_generators.py: Synthetic configs for the benchmarks.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Generators of synthetic config files stressing a single feature of the
+config tool, e.g. deep nesting, long parent chains or many objects. Every
+generator writes its files into a directory and returns the path of the
+config file to load.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+from config.constants import PARENT_CONFIG_TAG, INCLUDE_TAG, IMPORT_TAG, CLASS_TAG, OBJECT_PARM_TAG
+from tests.benchmark._utils import write_config
+
+
+__all__ = ['deep', 'wide', 'parent_chain', 'includes', 'imports', 'objects', 'deep_path']
+
+IMPORTS = ('json.dumps', 'json.loads', 'os.path.join', 'collections.OrderedDict', 'tests._utils.Dummy')
+
+
+def deep_path(depth):
+    """Returns the dotted path of the innermost value of a 'deep' config."""
+    return '.'.join(['root'] + ['child'] * (depth - 1) + ['value'])
+
+
+def deep(directory, depth=100):
+    """Config with a single value nested in 'depth' dictionaries."""
+    value = {'value': depth, 'items': list(range(10))}
+    for _ in range(depth - 1):
+        value = {'child': value, 'name': 'level'}
+    return write_config({'root': value}, directory=directory, name='deep')
+
+
+def wide(directory, n_keys=20000):
+    """Config with 'n_keys' toplevel values."""
+    return write_config({f'key_{i}': {'value': i, 'name': f'name_{i}', 'ratio': i / 7} for i in range(n_keys)},
+                        directory=directory, name='wide')
+
+
+def parent_chain(directory, length=50, n_keys=100):
+    """Config with 'length' parent configs, each overriding the values of its parent."""
+    parent = None
+    for level in range(length):
+        data = {f'key_{i}': {'value': level * i, 'level': level} for i in range(n_keys)}
+        if parent is not None:
+            data[PARENT_CONFIG_TAG] = parent.name
+        parent = write_config(data, directory=directory, name=f'chain_{level}')
+    return parent
+
+
+def includes(directory, n_includes=200, n_keys=50):
+    """Config including 'n_includes' configs."""
+    for i in range(n_includes):
+        write_config({f'key_{j}': {'value': i * j} for j in range(n_keys)}, directory=directory, name=f'include_{i}')
+    return write_config({f'module_{i}': f'{INCLUDE_TAG}include_{i}.json' for i in range(n_includes)},
+                        directory=directory, name='includes')
+
+
+def imports(directory, n_imports=5000):
+    """Config with 'n_imports' import strings."""
+    return write_config({'imports': [f'{IMPORT_TAG}{IMPORTS[i % len(IMPORTS)]}' for i in range(n_imports)]},
+                        directory=directory, name='imports')
+
+
+def objects(directory, n_objects=1000):
+    """Config with 'n_objects' objects, each with a nested object in its parameters."""
+    obj = {CLASS_TAG: 'tests._utils.Dummy',
+           OBJECT_PARM_TAG: {'a': 1, 'b': [1, 2, 3],
+                             'child': {CLASS_TAG: 'tests._utils.Dummy', OBJECT_PARM_TAG: {'c': 'value'}}}}
+    return write_config({'objects': [obj] * n_objects}, directory=directory, name='objects')
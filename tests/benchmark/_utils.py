@@ -0,0 +1,46 @@
+"""_utils.py: Benchmark utils.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Utility functions for the micro benchmarks.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+import json
+import timeit
+import tempfile
+from pathlib import Path
+
+
+__all__ = ['measure', 'print_results', 'write_config']
+
+
+def measure(fnc, number=10000, repeat=5):
+    """Returns the best time per call of 'fnc' in seconds."""
+    timer = timeit.Timer(fnc)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def print_results(title, results):
+    """Prints a table of (name, seconds per call) tuples."""
+    print(title)
+    width = max(len(name) for name, _ in results)
+    for name, sec in results:
+        print(f'  {name:<{width}}  {sec * 1e6:12.3f} us')
+
+
+def write_config(data, suffix='.json', directory=None, name='config'):
+    """Writes 'data' into a temporary config file and returns its path."""
+    directory = directory or tempfile.mkdtemp(prefix='config_bench_')
+    path = Path(directory, name + suffix)
+    with open(path, 'w') as file:
+        json.dump(data, file)
+    return path
@@ -0,0 +1,57 @@
+"""bench_access.py: Benchmark value access on ```Config```.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Compares the latency of attribute, ```__getitem__``` and ```get()``` access
+with the former ```dir(Config)``` based ```__getattribute__```.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+from config import Config
+from tests.benchmark._utils import measure, print_results, write_config
+
+
+class LegacyConfig(Config):
+    """Config with the former attribute lookup, calling 'dir' on every access."""
+
+    def __getitem__(self, item):
+        value = self.get(item)
+        if value:
+            return value
+
+        raise KeyError
+
+    def __getattribute__(self, item):
+        if item not in dir(Config):
+            value = self.get(item)
+            if value:
+                return value
+
+            raise AttributeError
+
+        return object.__getattribute__(self, item)
+
+
+def main():
+    path = write_config({'a': 123, 'b': [1, 2, 3], 'c': {'ca': 1, 'cb': 2}})
+
+    for cls in (LegacyConfig, Config):
+        cfg = cls(str(path))
+        print_results(cls.__name__, [
+            ('attribute', measure(lambda: cfg.a)),
+            ('__getitem__', measure(lambda: cfg['a'])),
+            ('get()', measure(lambda: cfg.get('a'))),
+            ('attribute (dict)', measure(lambda: cfg.c)),
+        ])
+
+
+if __name__ == '__main__':
+    main()
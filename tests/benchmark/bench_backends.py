@@ -0,0 +1,60 @@
+"""bench_backends.py: Benchmark the file format backends.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Compares load and write times of the installed JSON and YAML backends on a
+generated large config.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+import io
+
+from config._backends import get_backend, _CANDIDATES
+from tests.benchmark._utils import measure, print_results
+
+
+def generate(n_sections=200, n_keys=50):
+    """Generates a config with 'n_sections' sections of 'n_keys' values each."""
+    return {f'section_{i}': {f'key_{j}': {'value': i * j, 'name': f'name_{j}', 'ratio': j / 7,
+                                          'items': list(range(j % 10))}
+                             for j in range(n_keys)}
+            for i in range(n_sections)}
+
+
+def main():
+    data = generate()
+
+    for ext in ('.json', '.yaml'):
+        results = []
+        text = None
+        for name, _ in _CANDIDATES[ext]:
+            try:
+                backend = get_backend(ext, name)
+            except ImportError:
+                continue
+
+            file = io.StringIO()
+            backend.writer(data, file, indent=2, sort_keys=True)
+            text = text or file.getvalue()
+
+            number = 1 if 'yaml' in name else 5
+            results.append((f'{name} load', measure(lambda: backend.loader(text), number=number, repeat=3)))
+            results.append((f'{name} write', measure(lambda: backend.writer(data, io.StringIO()),
+                                                     number=number, repeat=3)))
+
+        if text is None:
+            print(f'{ext}: no backend installed, skipped')
+            continue
+        print_results(f'{ext} ({len(text) / 2 ** 20:.1f} MiB)', results)
+
+
+if __name__ == '__main__':
+    main()
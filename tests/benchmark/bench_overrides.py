@@ -0,0 +1,58 @@
+"""bench_overrides.py: Benchmark parsing commandline override values.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Compares the literal parser of the override values with the former
+'try_to_number' and 'eval' based evaluation on thousands of values.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+from config._utils import parse_value, try_to_number
+from tests.benchmark._utils import measure, print_results
+
+
+VALUES = {
+    'int': [str(i) for i in range(5000)],
+    'float': [str(i / 7) for i in range(5000)],
+    'bool/None': ['True', 'False', 'None'] * 1700,
+    'quoted string': [f'"name_{i}"' for i in range(5000)],
+    'list': [str(list(range(i % 10))) for i in range(5000)],
+    'dict': [str({'a': i, 'b': [i, 'x']}) for i in range(5000)],
+    'dict (JSON)': [f'{{"a": {i}, "b": [{i}, "x"]}}' for i in range(5000)],
+}
+
+
+def legacy_evaluate(val):
+    """The former evaluation of override values."""
+    value = val if val.startswith('"') or val.startswith("'") else try_to_number(val)
+    if not isinstance(value, str):
+        return value
+
+    try:
+        # pylint: disable=eval-used
+        value = eval(value)
+    except (ValueError, SyntaxError):
+        pass
+    return value
+
+
+def main():
+    results = []
+    for kind, values in VALUES.items():
+        assert [parse_value(v) for v in values] == [legacy_evaluate(v) for v in values]
+        results.append((f'{kind} legacy', measure(lambda: [legacy_evaluate(v) for v in values], number=3, repeat=3)))
+        results.append((f'{kind} parse_value', measure(lambda: [parse_value(v) for v in values], number=3, repeat=3)))
+
+    print_results('5000 override values (time per batch)', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""bench_suite.py: Benchmark suite of the config load and access hot paths.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Measures loading, accessing, instantiating, overriding, saving and hashing configs
+generated by 'tests.benchmark._generators'. Results can be stored as
+baseline and later runs compared against it, e.g.
+
+    python -m tests.benchmark.bench_suite --save main
+    python -m tests.benchmark.bench_suite --compare main
+
+Baselines are JSON files in 'tests/benchmark/baselines', they depend on the
+machine and are not committed, so a baseline has to be saved before the
+first comparison. The comparison
+exits with status 1 if a benchmark is slower than its baseline by more than
+'--threshold'.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+import sys
+import json
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+
+from config import Config, clear_file_cache, clear_fingerprint_cache
+from tests.benchmark import _generators as gen
+from tests.benchmark._utils import measure, print_results
+
+
+BASELINE_DIR = Path(__file__).parent / 'baselines'
+DEEP = 100
+
+
+def cold(path, **kwargs):
+    """Returns a function loading a config without the file cache, like in a new process."""
+    def load():
+        clear_file_cache()
+        return Config(str(path), cli=False, **kwargs)
+    return load
+
+
+def with_argv(args, fnc):
+    """Returns a function calling 'fnc' with the commandline arguments 'args'."""
+    def call():
+        argv = sys.argv
+        sys.argv = argv[:1] + args
+        try:
+            return fnc()
+        finally:
+            sys.argv = argv
+    return call
+
+
+def bench_load(directory):
+    return [
+        ('load deep', measure(cold(gen.deep(directory, depth=DEEP)), number=200, repeat=3)),
+        ('load wide', measure(cold(gen.wide(directory)), number=5, repeat=3)),
+        ('load parent chain', measure(cold(gen.parent_chain(directory)), number=5, repeat=3)),
+        ('load parent chain (cached)', measure(lambda: Config(str(directory / 'chain_49.json'), cli=False),
+                                               number=20, repeat=3)),
+        ('load includes', measure(cold(gen.includes(directory)), number=5, repeat=3)),
+        ('load imports', measure(cold(gen.imports(directory)), number=5, repeat=3)),
+        ('load objects', measure(cold(gen.objects(directory)), number=20, repeat=3)),
+    ]
+
+
+def bench_access(directory):
+    deep = Config(str(gen.deep(directory, depth=DEEP)), cli=False)
+    wide = Config(str(gen.wide(directory)), cli=False)
+    path = gen.deep_path(DEEP)
+    return [
+        ('attribute wide', measure(lambda: wide.key_100)),
+        ('get() wide', measure(lambda: wide.get('key_100'))),
+        ('at() deep', measure(lambda: deep.at(path))),
+    ]
+
+
+def bench_objects(directory):
+    cfg = Config(str(gen.objects(directory)), cli=False)
+    return [
+        ('get() objects', measure(lambda: cfg.get('objects'), number=20, repeat=3)),
+        ('get() classes', measure(lambda: cfg.get('objects', instance=False), number=20, repeat=3)),
+    ]
+
+
+def bench_overrides(directory):
+    path = gen.wide(directory)
+    args = [arg for i in range(0, 2000, 20) for arg in (f'--key_{i}.value', str(-i))]
+    overrides = {f'key_{i}.{key}': -i for i in range(0, 5000, 2) for key in ('value', 'ratio')}
+    Config(str(path), cli=False)
+    return [
+        ('load wide (cached)', measure(lambda: Config(str(path), cli=False), number=20, repeat=3)),
+        ('load wide + 100 overrides', measure(with_argv(args, lambda: Config(str(path))), number=20, repeat=3)),
+        ('load wide + 5000 overrides', measure(lambda: Config(str(path), cli=False, overrides=overrides),
+                                               number=20, repeat=3)),
+    ]
+
+
+def bench_save(directory):
+    cfg = Config(str(gen.wide(directory)), cli=False)
+    deep = Config(str(gen.deep(directory, depth=DEEP)), cli=False)
+    return [
+        ('save_to wide', measure(lambda: cfg.save_to(str(directory / 'out_wide.json')), number=5, repeat=3)),
+        ('save_to deep', measure(lambda: deep.save_to(str(directory / 'out_deep.json')), number=200, repeat=3)),
+    ]
+
+
+def bench_fingerprint(directory):
+    cfg = Config(str(gen.wide(directory)), cli=False)
+
+    def cold_fingerprint():
+        clear_fingerprint_cache()
+        return cfg.with_overrides({}).fingerprint()
+
+    return [
+        ('fingerprint wide', measure(cold_fingerprint, number=5, repeat=3)),
+        ('fingerprint wide (cached)', measure(cfg.fingerprint, number=20, repeat=3)),
+        ('fingerprint wide + override', measure(lambda: cfg.with_overrides({'key_100.value': -1}).fingerprint(),
+                                                 number=20, repeat=3)),
+    ]
+
+
+BENCHMARKS = {
+    'load': bench_load,
+    'access': bench_access,
+    'objects': bench_objects,
+    'overrides': bench_overrides,
+    'save': bench_save,
+    'fingerprint': bench_fingerprint,
+}
+
+
+def compare(results, baseline, threshold):
+    """Prints the results relative to the baseline and returns the names of all regressions."""
+    width = max(len(name) for name in results)
+    regressions = []
+    for name, sec in results.items():
+        if name not in baseline:
+            print(f'  {name:<{width}}  {sec * 1e6:12.3f} us  (new)')
+            continue
+
+        ratio = sec / baseline[name]
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f'  {name:<{width}}  {sec * 1e6:12.3f} us  {baseline[name] * 1e6:12.3f} us  {ratio:6.2f}x{flag}')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('benchmarks', nargs='*', metavar='BENCHMARK',
+                        help=f"Benchmarks to run, all by default ({', '.join(BENCHMARKS)})")
+    parser.add_argument('--save', metavar='NAME', help='Store the results as baseline NAME')
+    parser.add_argument('--compare', metavar='NAME', help='Compare the results to baseline NAME')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Relative slowdown reported as regression (default: 0.1)')
+    args = parser.parse_args(argv)
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f'unknown benchmark {name}')
+    if args.compare and not (BASELINE_DIR / f'{args.compare}.json').exists():
+        # baselines depend on the machine, so none are committed
+        parser.error(f'no baseline {args.compare}, create it with --save {args.compare} first')
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='config_bench_') as directory:
+        for name in args.benchmarks or BENCHMARKS:
+            group = BENCHMARKS[name](Path(directory))
+            print_results(name, group)
+            results.update(group)
+
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        with open(BASELINE_DIR / f'{args.save}.json', 'w') as file:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(), 'results': results},
+                      file, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(BASELINE_DIR / f'{args.compare}.json') as file:
+            baseline = json.load(file)
+        print(f"compared to {args.compare} (Python {baseline['python']}, {baseline['platform']})")
+        if compare(results, baseline['results'], args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
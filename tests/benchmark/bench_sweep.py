@@ -0,0 +1,67 @@
+"""bench_sweep.py: Benchmark the generation of config variants.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Compares generating 10k variants of a config with ```Config.sweep``` against
+loading a new config with commandline overrides per variant.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+import sys
+import time
+import itertools
+
+from config import Config, clear_file_cache
+from tests.benchmark._utils import print_results, write_config
+from tests.benchmark.bench_backends import generate
+
+
+GRID = {
+    'section_0.key_0.value': list(range(10)),
+    'section_1.key_1.ratio': [i / 10 for i in range(10)],
+    'section_2.key_2.items.0': list(range(100)),
+}
+
+
+def load_with_argv(path, overrides):
+    argv = sys.argv
+    sys.argv = argv[:1] + [arg for name, value in overrides.items() for arg in (f'--{name}', str(value))]
+    try:
+        return Config(str(path))
+    finally:
+        sys.argv = argv
+
+
+def main():
+    path = write_config(generate(n_sections=100, n_keys=20))
+    combinations = [dict(zip(GRID, values)) for values in itertools.product(*GRID.values())]
+
+    start = time.perf_counter()
+    variants = list(Config.sweep(str(path), GRID))
+    sweep = (time.perf_counter() - start) / len(variants)
+
+    n_argv = 50
+    clear_file_cache()
+    start = time.perf_counter()
+    for overrides in combinations[:n_argv]:
+        # without file cache, as loading in a new process
+        load_with_argv(path, overrides)
+        clear_file_cache()
+    argv = (time.perf_counter() - start) / n_argv
+
+    print_results(f'{len(variants)} variants (time per variant)', [
+        ('Config.sweep', sweep),
+        ('Config per variant', argv),
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""test_backends.py: Tests for the file format backends.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Tests for the registry of file format backends.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from unittest import TestCase
+
+from config import Config, register_loader, register_writer
+from config._backends import get_backend, get_file_loader, get_file_writer, _CANDIDATES
+from tests._utils import Dummy
+
+
+SAMPLE = {'a': 123, 'b': [1, 2, 3], 'c': {'ca': 1.5, 'cb': 'text', 'cc': None, 'cd': True}}
+
+
+class TestBackends(TestCase):
+
+    def available(self, ext):
+        for name, _ in _CANDIDATES[ext]:
+            try:
+                yield get_backend(ext, name)
+            except ImportError:
+                pass
+
+    def test_json_roundtrip(self):
+        for backend in self.available('.json'):
+            with self.subTest(backend=backend.name):
+                file = io.StringIO()
+                backend.writer(SAMPLE, file, indent=2, sort_keys=True)
+                self.assertDictEqual(SAMPLE, backend.loader(file.getvalue()))
+
+    def test_yaml_roundtrip(self):
+        for ext in ('.yml', '.yaml'):
+            for backend in self.available(ext):
+                with self.subTest(ext=ext, backend=backend.name):
+                    file = io.StringIO()
+                    backend.writer(SAMPLE, file, indent=2, sort_keys=True)
+                    self.assertDictEqual(SAMPLE, backend.loader(file.getvalue()))
+
+    def test_writer_default(self):
+        data = {'a': (1, Dummy), 'b': {'ba': [Dummy]}, 'c': 'text'}
+        expected = {'a': [1, 'Dummy'], 'b': {'ba': ['Dummy']}, 'c': 'text'}
+        for ext in ('.json', '.yaml'):
+            for backend in self.available(ext):
+                with self.subTest(ext=ext, backend=backend.name):
+                    file = io.StringIO()
+                    backend.writer(data, file, indent=2, sort_keys=True, default=lambda obj: obj.__name__)
+                    self.assertDictEqual(expected, backend.loader(file.getvalue()))
+
+    def test_json_writer_options(self):
+        # integer keys, e.g. of YAML files, are written as strings
+        data = {'a': {1: 'x', 2: [1, 2]}, 'b': 1}
+        expected = {'a': {'1': 'x', '2': [1, 2]}, 'b': 1}
+        for backend in self.available('.json'):
+            for indent in (0, 2, 4):
+                with self.subTest(backend=backend.name, indent=indent):
+                    file = io.StringIO()
+                    backend.writer(data, file, indent=indent, sort_keys=True)
+                    self.assertDictEqual(expected, json.loads(file.getvalue()))
+                    if indent:
+                        self.assertIn('\n' + ' ' * indent + '"a"', file.getvalue())
+
+    def test_stream_writer(self):
+        data = {f'key_{i}': {'value': i, 'items': [i, str(i)]} for i in range(2500)}
+        for indent in (2, 0):
+            for sort_keys in (True, False):
+                with self.subTest(indent=indent, sort_keys=sort_keys):
+                    file = io.StringIO()
+                    get_backend('.json').writer(data, file, indent=indent, sort_keys=sort_keys)
+                    loaded = get_file_loader('.json')(file.getvalue())
+                    self.assertDictEqual(data, loaded)
+                    self.assertListEqual(sorted(data) if sort_keys else list(data), list(loaded))
+
+    def test_stream_writer_mixed_keys(self):
+        # e.g. integer and string keys of YAML files
+        try:
+            backend = get_backend('.json', 'orjson')
+        except ImportError:
+            self.skipTest('orjson is not installed')
+        small = {1: 'a', 'b': 2, 10: 'c', 'a': None}
+        large = {**{i: i for i in range(1500)}, **{f'key_{i}': i for i in range(1500)}, 1.5: 'x', None: 'y'}
+        for data in (small, large):
+            for indent in (2, 0):
+                with self.subTest(size=len(data), indent=indent):
+                    file = io.StringIO()
+                    backend.writer(data, file, indent=indent, sort_keys=True)
+                    loaded = json.loads(file.getvalue())
+                    self.assertListEqual(sorted(loaded), list(loaded))
+                    self.assertEqual(len(data), len(loaded))
+
+    def test_stream_loader(self):
+        for ext in ('.json', '.yaml'):
+            for backend in self.available(ext):
+                if backend.stream_loader is None:
+                    continue
+
+                with self.subTest(ext=ext, backend=backend.name), tempfile.TemporaryDirectory() as tmpdir:
+                    path = Path(tmpdir, 'config' + ext)
+                    with open(path, 'w') as file:
+                        backend.writer(SAMPLE, file, indent=2, sort_keys=True)
+
+                    with open(path, 'rb') as file:
+                        self.assertDictEqual(SAMPLE, backend.stream_loader(file))
+
+    def test_json_fallback(self):
+        value = get_file_loader('.JSON')('[NaN]')[0]
+        self.assertNotEqual(value, value)
+
+    def test_json_big_numbers(self):
+        data = {'x': 123456789012345678901234567890, 'y': -2 ** 63 - 1, 'z': 2 ** 64 - 1, 'w': 1.5}
+        text = json.dumps(data)
+        self.assertDictEqual(data, get_file_loader('.json')(text))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, 'config.json')
+            path.write_text(text)
+            stream_loader = get_backend('.json').stream_loader
+            if stream_loader is not None:
+                with open(path, 'rb') as file:
+                    self.assertDictEqual(data, stream_loader(file))
+
+        for indent in (2, 0):
+            with self.subTest(indent=indent):
+                file = io.StringIO()
+                get_backend('.json').writer(data, file, indent=indent, sort_keys=True)
+                self.assertDictEqual(data, json.loads(file.getvalue()))
+
+    def test_unknown_extension(self):
+        self.assertRaises(ValueError, get_file_loader, '.unknown')
+        self.assertRaises(ValueError, get_file_writer, '.unknown')
+
+    def test_register(self):
+        def loader(text):
+            return dict(line.split('=') for line in text.splitlines())
+
+        def writer(data, file, indent=2, sort_keys=True):
+            for key in sorted(data) if sort_keys else data:
+                file.write(f'{key}={data[key]}\n')
+
+        register_loader('.ini', loader)
+        register_writer('ini', writer)
+        self.addCleanup(register_loader, '.ini', None)
+        self.addCleanup(register_writer, '.ini', None)
+
+        argv = sys.argv
+        sys.argv = sys.argv[:1]
+        self.addCleanup(setattr, sys, 'argv', argv)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, 'config.ini')
+            path.write_text('b=2\na=1\n')
+
+            cfg = Config(str(path))
+            self.assertDictEqual({'a': '1', 'b': '2'}, cfg.__dict__)
+
+            cfg.save_to(str(path))
+            self.assertEqual('a=1\nb=2\n', path.read_text())
@@ -16,15 +16,19 @@ Version  Date        Author             Description
 
 import os
 import sys
+import copy
 import json
+import pickle
 from pathlib import Path
+from typing import Dict, List
 
 from unittest import TestCase
 from unittest.mock import patch
 
-from config import Config
+from config import Config, compile_path, ValidationError
 from config.constants import ENV_CONFIG_NAME, CONFIG_ARG_TAG
-from tests._utils import get_config_mock
+from config._utils import _parse_args
+from tests._utils import get_config_mock, Dummy, Slow
 from tests._samples import get_sample, get_target
 
 
@@ -60,7 +64,7 @@ class TestConfig(TestCase):
         Config()
 
         self.mock_open.assert_called_once()
-        self.mock_open.assert_called_with(Path('.', 'configs', 'config.json'))
+        self.mock_open.assert_called_with(Path('.', 'configs', 'config.json'), encoding='utf-8')
 
     def test_init_env(self):
         os.environ[ENV_CONFIG_NAME] = 'config_1.json'
@@ -68,7 +72,14 @@ class TestConfig(TestCase):
         os.environ.pop(ENV_CONFIG_NAME)
 
         self.mock_open.assert_called_once()
-        self.mock_open.assert_called_with(Path('config_1.json'))
+        self.mock_open.assert_called_with(Path('config_1.json'), encoding='utf-8')
+
+    def test_init_env_no_cli(self):
+        with patch.dict('os.environ', {ENV_CONFIG_NAME: 'config_1.json'}):
+            Config(cli=False)
+
+        self.mock_open.assert_called_once()
+        self.mock_open.assert_called_with(Path('.', 'configs', 'config.json'), encoding='utf-8')
 
     def test_init_cli_arg(self):
         args = [CONFIG_ARG_TAG, 'config_3.json']
@@ -81,13 +92,13 @@ class TestConfig(TestCase):
                 sys.argv.remove(arg)
 
         self.mock_open.assert_called_once()
-        self.mock_open.assert_called_with(Path('config_3.json'))
+        self.mock_open.assert_called_with(Path('config_3.json'), encoding='utf-8')
 
     def test_init_filename(self):
         Config('config_2.json')
 
         self.mock_open.assert_called_once()
-        self.mock_open.assert_called_with(Path('config_2.json'))
+        self.mock_open.assert_called_with(Path('config_2.json'), encoding='utf-8')
 
     def test_init_filename_not_exists(self):
         self.patch_exists.stop()
@@ -236,6 +247,20 @@ class TestConfig(TestCase):
 
         self.assertEqual('invalid python expression', c.a)
 
+    def test_init_cli_override9(self):
+        args = ['--a', '__import__("os").getcwd()', '--b', 'true', '--c', 'plain']
+        sys.argv += args
+
+        try:
+            c = Config('SAMPLE_01')
+        finally:
+            for arg in args:
+                sys.argv.remove(arg)
+
+        self.assertEqual('__import__("os").getcwd()', c.a)
+        self.assertIs(True, c.b)
+        self.assertEqual('plain', c.c)
+
     def test_access_attr(self):
         c = Config('SAMPLE_01')
         trg = get_target('SAMPLE_01')
@@ -265,3 +290,253 @@ class TestConfig(TestCase):
         self.assertDictEqual(trg['c'], c.get('c'))
         self.assertListEqual(trg['d'], c.get('d'))
         self.assertDictEqual(trg['e'], c.get('e'))
+
+    def test_access_falsy_values(self):
+        c = Config('SAMPLE_06')
+        trg = get_target('SAMPLE_06')
+
+        for key in trg:
+            self.assertEqual(trg[key], getattr(c, key))
+            self.assertEqual(trg[key], c[key])
+            self.assertEqual(trg[key], c.get(key))
+
+    def test_access_missing(self):
+        c = Config('SAMPLE_01')
+
+        self.assertRaises(AttributeError, getattr, c, 'x')
+        self.assertRaises(KeyError, c.__getitem__, 'x')
+        self.assertIsNone(c.get('x'))
+        self.assertFalse(hasattr(c, 'x'))
+
+    def test_object_cache(self):
+        c = Config('SAMPLE_05', cache=True)
+
+        co1 = c.c['cb'][0]
+        self.assertIs(co1, c.c['cb'][0])
+        self.assertIs(co1, c['c']['cb'][0])
+        self.assertIs(co1, c.get('c')['cb'][0])
+        self.assertIsNot(co1, c.get('c', cache=False)['cb'][0])
+        self.assertIsNot(co1, c.get('c', d=4)['cb'][0])
+
+        c.clear_cache('c')
+        self.assertIsNot(co1, c.c['cb'][0])
+
+    def test_object_cache_disabled(self):
+        c = Config('SAMPLE_05')
+
+        co1 = c.c['cb'][0]
+        self.assertIsNot(co1, c.c['cb'][0])
+        self.assertIs(c.get('c', cache=True), c.get('c', cache=True))
+
+    def test_lazy_import(self):
+        c = Config('SAMPLE_03', lazy=True)
+        self.assertDictEqual(get_sample('SAMPLE_03'), c.__dict__)
+
+        self.assertDictEqual(get_target('SAMPLE_03')['c'], c.c)
+        self.assertDictEqual(get_target('SAMPLE_03'), c.__dict__)
+
+    def test_lazy_include(self):
+        c = Config('SAMPLE_04', lazy=True)
+        self.mock_open.assert_called_once()
+
+        self.assertDictEqual(get_target('SAMPLE_04')['c'], c['c'])
+        self.assertEqual(2, self.mock_open.call_count)
+
+        self.assertDictEqual(get_target('SAMPLE_04')['c'], c.get('c'))
+        self.assertEqual(2, self.mock_open.call_count)
+
+    def test_lazy_cli_override(self):
+        args = ['--c.cc', '321']
+        sys.argv += args
+
+        try:
+            c = Config('SAMPLE_03', lazy=True)
+        finally:
+            for arg in args:
+                sys.argv.remove(arg)
+
+        self.assertEqual(321, c.c['cc'])
+        self.assertIs(get_target('SAMPLE_03')['c']['cb'], c.c['cb'])
+
+    def test_include_cli_override(self):
+        args = ['--c.ca.ccb', '321']
+        sys.argv += args
+
+        try:
+            c = Config('SAMPLE_04')
+        finally:
+            for arg in args:
+                sys.argv.remove(arg)
+
+        self.assertDictEqual({'ca': {'cca': 1, 'ccb': 321}}, c.c)
+
+    def test_include_cli_parsed_once(self):
+        args = ['--a', '321']
+        sys.argv += args
+
+        _parse_args.cache_clear()
+        try:
+            Config('SAMPLE_04')
+            Config('SAMPLE_04')
+        finally:
+            for arg in args:
+                sys.argv.remove(arg)
+
+        self.assertEqual(1, _parse_args.cache_info().misses)
+
+    def test_init_no_cli(self):
+        args = ['--a', '321']
+        sys.argv += args
+
+        try:
+            c = Config('SAMPLE_01', cli=False)
+        finally:
+            for arg in args:
+                sys.argv.remove(arg)
+
+        self.assertEqual(123, c.a)
+
+    def test_iter(self):
+        c = Config('SAMPLE_01')
+
+        self.assertListEqual(get_target('SAMPLE_01')['b'], list(c.iter('b')))
+        self.assertListEqual(get_target('SAMPLE_01')['d'], list(c.iter('d')))
+        self.assertRaises(KeyError, c.iter, 'x')
+        self.assertRaises(TypeError, c.iter, 'c')
+
+    def test_iter_objects(self):
+        c = Config('SAMPLE_05')
+        trg = get_target('SAMPLE_05')['c']['cb']
+
+        items = c.iter('cb', dictionary=c.__dict__['c'], d=4)
+        co1 = next(items)
+        self.assertTupleEqual(trg[0].args, co1.args)
+        self.assertDictEqual(dict(trg[0].kwargs, d=4), co1.kwargs)
+
+        co2 = next(items)
+        self.assertTupleEqual(trg[1].args, co2.args)
+        self.assertDictEqual({'d': 4}, co2.kwargs)
+        self.assertRaises(StopIteration, next, items)
+
+        self.assertListEqual([trg[0].__class__] * 2, list(c.iter('cb', dictionary=c.__dict__['c'], instance=False)))
+
+    def test_load_object_parallel(self):
+        c = Config('SAMPLE_05')
+        trg = get_target('SAMPLE_05')['c']['cb']
+
+        co1, co2 = c.get('c', parallel=True)['cb']
+        self.assertTupleEqual(trg[0].args, co1.args)
+        self.assertDictEqual(trg[0].kwargs, co1.kwargs)
+        self.assertTupleEqual(trg[1].args, co2.args)
+        self.assertDictEqual(trg[1].kwargs, co2.kwargs)
+
+    def test_with_overrides(self):
+        c = Config('SAMPLE_01')
+        v = c.with_overrides({'a': 1, 'd.1.cb': 321, 'f.0.fa': [1, 2]})
+
+        self.assertDictEqual(get_target('SAMPLE_01'), c.__dict__)
+        self.assertEqual(1, v.a)
+        self.assertEqual(321, v.d[1]['cb'])
+        self.assertListEqual([{'fa': [1, 2]}], v.f)
+        self.assertIs(c.__dict__['b'], v.__dict__['b'])
+        self.assertIs(c.__dict__['d'][0], v.__dict__['d'][0])
+
+    def test_with_overrides_sequential(self):
+        c = Config('SAMPLE_01')
+
+        # the same result as setting the paths one after another
+        v = c.with_overrides({'g': [None], 'g.1.0.a': [7], 'g.1': 5})
+        self.assertListEqual([None, 5], v.g)
+        v = c.with_overrides({'a.x': 1, 'a': None})
+        self.assertDictEqual({'x': 1}, v.a)
+        v = c.with_overrides({'a': None, 'a.x': 1})
+        self.assertDictEqual({'x': 1}, v.a)
+        v = c.with_overrides({'h.x': 1, 'h': {'y': 2}, 'h.z': 3})
+        self.assertDictEqual({'y': 2, 'z': 3}, v.h)
+        self.assertDictEqual(get_target('SAMPLE_01'), c.__dict__)
+
+    def test_pickle(self):
+        c = Config('SAMPLE_03', cache=True)
+        lazy = Config('SAMPLE_03', lazy=True)
+        c.watch(lambda config, changed: None, interval=60)
+        self.addCleanup(c.unwatch)
+
+        copies = {'pickle': lambda cfg: pickle.loads(pickle.dumps(cfg)), 'deepcopy': copy.deepcopy}
+        for name, copy_config in copies.items():
+            with self.subTest(copy=name):
+                d = copy_config(c)
+                self.assertDictEqual(get_target('SAMPLE_03'), d.__dict__)
+                self.assertIs(Dummy, d.c['cb'])
+                self.assertIsNone(d._watcher)
+                self.assertEqual(c.fingerprint(), d.fingerprint())
+                self.assertEqual(5, d.with_overrides({'a': 5}).a)
+
+                d = copy_config(lazy)
+                self.assertDictEqual(get_target('SAMPLE_03'), {'c': d.c})
+
+    def test_at(self):
+        c = Config('SAMPLE_01')
+
+        self.assertEqual(123, c.at('a'))
+        self.assertEqual(2, c.at('d.1.cb'))
+        self.assertEqual(3, c.at('e.cb.2'))
+        self.assertListEqual([1, 2, 3], c.at('e.ca'))
+        self.assertIsNone(c.at('e.cc.0'))
+        self.assertEqual(-1, c.at('x.y', default=-1))
+        self.assertEqual(-1, c.at('b.3', default=-1))
+
+    def test_at_compiled(self):
+        c = Config('SAMPLE_01')
+        path = compile_path('d.0.ca')
+
+        self.assertEqual(1, c.at(path))
+        self.assertEqual(5, c.with_overrides({'d.0.ca': 5}).at(path))
+        self.assertEqual(1, c.at(path))
+
+    def test_at_object(self):
+        c = Config('SAMPLE_05')
+
+        obj = c.at('c.cb.1', d=4)
+        self.assertIsInstance(obj, Dummy)
+        self.assertTupleEqual((1, 2, 3), obj.args)
+        self.assertDictEqual({'d': 4}, obj.kwargs)
+        self.assertIs(Dummy, c.at('c.cb.1', instance=False))
+
+    def test_at_after_override(self):
+        c = Config('SAMPLE_01')
+        self.assertEqual(2, c.at('c.cb'))
+
+        c._apply_overrides({'c.cb': 7})
+        self.assertEqual(7, c.at('c.cb'))
+
+    def test_validate(self):
+        schema = {'a': float, 'b': [int], 'c': {'ca': int, 'cb': int, 'cc': int}, 'd': list,
+                  'e': Dict[str, List[int]]}
+        c = Config('SAMPLE_01', schema=schema)
+
+        self.assertIsInstance(c.a, float)
+        self.assertDictEqual(get_target('SAMPLE_01'), c.__dict__)
+        self.assertIsInstance(c.with_overrides({'a': 1}).a, float)
+
+        with self.assertRaises(ValidationError) as ctx:
+            c.with_overrides({'c.cd': 1, 'e.ca.0': 'x'})
+        self.assertDictEqual({'c.cd': 'unknown key', 'e.ca.0': 'expected int, got str'}, ctx.exception.errors)
+
+    def test_validate_params(self):
+        c = Config('SAMPLE_05')
+        c.validate()
+        c.validate({'c': {'ca': int, 'cb': [Dummy]}})
+
+        with self.assertRaises(ValidationError) as ctx:
+            c.validate({'c': {'ca': str, 'cb': [Slow]}})
+        self.assertSetEqual({'c.ca', 'c.cb.0', 'c.cb.1'}, set(ctx.exception.errors))
+
+    def test_sweep(self):
+        c = Config('SAMPLE_01')
+        variants = list(Config.sweep(c, {'a': [1, 2], 'c.ca': [3, 4, 5]}))
+
+        self.assertEqual(6, len(variants))
+        self.assertListEqual([(1, 3), (1, 4), (1, 5), (2, 3), (2, 4), (2, 5)],
+                             [(v.a, v.c['ca']) for v in variants])
+        self.assertTrue(all(v.__dict__['e'] is c.__dict__['e'] for v in variants))
+        self.assertDictEqual(get_target('SAMPLE_01'), c.__dict__)
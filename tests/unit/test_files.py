@@ -0,0 +1,565 @@
+"""test_files.py: Tests for ```Config``` loading real config files.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Tests for ```Config``` loading config files from a temporary directory.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+import os
+import sys
+import json
+import math
+import asyncio
+import builtins
+import threading
+import tempfile
+from pathlib import Path
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from config import Config, clear_file_cache, clear_import_cache, clear_fingerprint_cache
+from config import config as config_module
+from config import _fingerprint
+from config.constants import PARENT_CONFIG_TAG, INCLUDE_TAG, IMPORT_TAG, CLASS_TAG, OBJECT_PARM_TAG, \
+    ENV_PROFILE_NAME, ENV_OVERRIDES_NAME
+from config._snapshot import snapshot_path
+from config._profile import LoadStats, recording
+from tests._utils import Dummy
+
+
+def run(coroutine):
+    # 'asyncio.run' is new in Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestConfigFiles(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.argv = list(sys.argv)
+        sys.argv = sys.argv[:1]
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.argv = cls.argv
+
+    def setUp(self):
+        clear_file_cache()
+        self.addCleanup(clear_file_cache)
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name)
+
+        self.write('base.json', {'a': 1, 'b': {'ba': [1, 2, 3]}})
+        self.write('modules/module.json', {'ma': 1, 'mb': [1, 2]})
+        self.write('exp_1.json', {PARENT_CONFIG_TAG: 'base.json', 'a': 2,
+                                  'm': f'{INCLUDE_TAG}modules/module.json'})
+        self.write('exp_2.json', {PARENT_CONFIG_TAG: 'base.json', 'a': 3,
+                                  'm': f'{INCLUDE_TAG}modules/module.json'})
+
+    def write(self, filename, data):
+        path = self.path / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump(data, file)
+        return path
+
+    def test_parent_and_include(self):
+        c = Config(str(self.path / 'exp_1.json'))
+
+        self.assertDictEqual({'a': 2, 'b': {'ba': [1, 2, 3]}, 'm': {'ma': 1, 'mb': [1, 2]}}, c.__dict__)
+
+    def test_shared_files_parsed_once(self):
+        with patch('builtins.open', wraps=builtins.open) as mock_open:
+            Config(str(self.path / 'exp_1.json'))
+            Config(str(self.path / 'exp_2.json'))
+            Config(str(self.path / 'exp_1.json'))
+
+        opened = [Path(call[0][0]).name for call in mock_open.call_args_list]
+        self.assertListEqual(['exp_1.json', 'base.json', 'module.json', 'exp_2.json'], opened)
+
+    def test_shared_files_isolated(self):
+        args = ['--b.ba.0', '9', '--m.ma', '2', '--m.mb.1', '3']
+        sys.argv += args
+
+        try:
+            c1 = Config(str(self.path / 'exp_1.json'))
+        finally:
+            for arg in args:
+                sys.argv.remove(arg)
+
+        self.assertListEqual([9, 2, 3], c1.b['ba'])
+        self.assertDictEqual({'ma': 2, 'mb': [1, 3]}, c1.m)
+
+        c2 = Config(str(self.path / 'exp_2.json'))
+        self.assertListEqual([1, 2, 3], c2.b['ba'])
+        self.assertDictEqual({'ma': 1, 'mb': [1, 2]}, c2.m)
+
+    def test_shared_values(self):
+        c1 = Config(str(self.path / 'exp_1.json'))
+        c2 = Config(str(self.path / 'exp_2.json'))
+
+        self.assertIs(c1.__dict__['b'], c2.__dict__['b'])
+        self.assertIs(c1.__dict__['m']['mb'], c2.__dict__['m']['mb'])
+
+    def test_shared_values_modified_in_place(self):
+        c1 = Config(str(self.path / 'exp_1.json'))
+        c2 = Config(str(self.path / 'exp_2.json'))
+
+        # loaded values are new containers
+        c1.b['ba'].append(4)
+        c1.at('b.ba').append(5)
+        c1['m']['mb'].append(6)
+        self.assertListEqual([1, 2, 3], c2.b['ba'])
+        self.assertListEqual([1, 2], c2.m['mb'])
+
+        # the values of the files are shared, not copied
+        c1.__dict__['b']['ba'].append(4)
+        self.assertListEqual([1, 2, 3, 4], c2.b['ba'])
+        self.assertListEqual([1, 2, 3, 4], Config(str(self.path / 'exp_1.json')).b['ba'])
+
+    def test_changed_file_reloaded(self):
+        Config(str(self.path / 'exp_1.json'))
+        self.write('base.json', {'a': 1, 'b': {'ba': [3, 2, 1, 0]}})
+
+        c = Config(str(self.path / 'exp_2.json'))
+        self.assertListEqual([3, 2, 1, 0], c.b['ba'])
+
+    def test_snapshot(self):
+        self.write('exp_3.json', {PARENT_CONFIG_TAG: 'exp_1.json', 'd': f'{IMPORT_TAG}tests._utils.Dummy'})
+        cfile = self.path / 'exp_3.json'
+
+        c1 = Config(str(cfile), snapshot=True)
+        self.assertTrue(snapshot_path(cfile).exists())
+
+        clear_file_cache()
+        with patch('builtins.open', wraps=builtins.open) as mock_open:
+            c2 = Config(str(cfile), snapshot=True)
+
+        opened = [Path(call[0][0]).name for call in mock_open.call_args_list]
+        self.assertListEqual([snapshot_path(cfile).name], opened)
+        self.assertDictEqual(c1.__dict__, c2.__dict__)
+        self.assertIs(Dummy, c2.d)
+
+    def test_snapshot_imports(self):
+        cfile = self.write_model()
+        c = Config(str(cfile))
+        c.save_to(str(self.path / 'saved.json'))
+        Config(str(cfile), snapshot=True)
+
+        snapshot = Config(str(cfile), snapshot=True)
+        snapshot.save_to(str(self.path / 'saved_snapshot.json'))
+
+        self.assertEqual(c.fingerprint(), snapshot.fingerprint())
+        with open(self.path / 'saved.json') as file, open(self.path / 'saved_snapshot.json') as snapshot_file:
+            self.assertEqual(file.read(), snapshot_file.read())
+        with open(self.path / 'saved_snapshot.json') as file:
+            self.assertEqual(f'{IMPORT_TAG}os.path.join', json.load(file)['fnc'])
+
+    def test_snapshot_modules(self):
+        cfile = self.write('modules.json', {'mod': f'{IMPORT_TAG}json', 'mods': [f'{IMPORT_TAG}os.path']})
+        c1 = Config(str(cfile), snapshot=True)
+        self.assertTrue(snapshot_path(cfile).exists())
+
+        clear_file_cache()
+        with patch('builtins.open', wraps=builtins.open) as mock_open:
+            c2 = Config(str(cfile), snapshot=True)
+
+        self.assertListEqual([snapshot_path(cfile).name], [Path(call[0][0]).name for call in mock_open.call_args_list])
+        self.assertIs(json, c2.mod)
+        self.assertIs(os.path, c2.mods[0])
+        self.assertEqual(c1.fingerprint(), c2.fingerprint())
+
+    def test_snapshot_outdated(self):
+        cfile = self.path / 'exp_1.json'
+        Config(str(cfile), snapshot=True)
+
+        self.write('modules/module.json', {'ma': 2})
+        c = Config(str(cfile), snapshot=True)
+        self.assertDictEqual({'ma': 2}, c.m)
+
+        c = Config(str(cfile), snapshot=True)
+        self.assertDictEqual({'ma': 2}, c.m)
+
+    def test_snapshot_cli_override(self):
+        cfile = self.path / 'exp_1.json'
+        args = ['--a', '321']
+        sys.argv += args
+
+        try:
+            c = Config(str(cfile), snapshot=True)
+        finally:
+            for arg in args:
+                sys.argv.remove(arg)
+
+        self.assertEqual(321, c.a)
+        self.assertEqual(2, Config(str(cfile), snapshot=True).a)
+
+    def test_stream_large_files(self):
+        expected = Config(str(self.path / 'exp_1.json')).__dict__
+        self.write('exp_1.yaml', {PARENT_CONFIG_TAG: 'base.json', 'a': 2,
+                                  'm': f'{INCLUDE_TAG}modules/module.json'})
+
+        clear_file_cache()
+        with patch('config.config.MMAP_THRESHOLD', 0):
+            self.assertDictEqual(expected, Config(str(self.path / 'exp_1.json')).__dict__)
+            self.assertDictEqual(expected, Config(str(self.path / 'exp_1.yaml')).__dict__)
+
+    def test_prefetch(self):
+        modules = {f'm{i}': f'{INCLUDE_TAG}modules/module_{i}.json' for i in range(10)}
+        for i in range(10):
+            self.write(f'modules/module_{i}.json', {'index': i, 'sub': f'{INCLUDE_TAG}module.json'})
+        self.write('exp_4.json', dict(modules, parent='exp_1.json', l=[f'{INCLUDE_TAG}modules/module_0.json']))
+        expected = Config(str(self.path / 'exp_4.json')).__dict__
+
+        clear_file_cache()
+        threads = []
+        real_open = builtins.open
+
+        def record_open(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return real_open(*args, **kwargs)
+
+        with patch('builtins.open', side_effect=record_open) as mock_open:
+            c = Config(str(self.path / 'exp_4.json'), prefetch=4)
+
+        self.assertDictEqual(expected, c.__dict__)
+        opened = [Path(call[0][0]).name for call in mock_open.call_args_list]
+        self.assertEqual(14, len(opened))
+        self.assertEqual(14, len(set(opened)))
+        self.assertNotIn(threading.main_thread(), threads)
+
+    def test_aload(self):
+        expected = Config(str(self.path / 'exp_1.json'))
+        clear_file_cache()
+
+        async def load():
+            return await asyncio.gather(Config.aload(str(self.path / 'exp_1.json')),
+                                        Config.aload(str(self.path / 'exp_2.json'), lazy=True))
+
+        c1, c2 = run(load())
+        self.assertIsInstance(c1, Config)
+        self.assertDictEqual(expected.__dict__, c1.__dict__)
+        self.assertEqual(3, c2.a)
+        self.assertDictEqual(expected.m, c2.m)
+
+    def test_aload_locate_in_executor(self):
+        threads = []
+        locate = config_module._locate_config_file
+
+        def locate_config_file(*args):
+            threads.append(threading.get_ident())
+            return locate(*args)
+
+        with patch.object(config_module, '_locate_config_file', side_effect=locate_config_file):
+            run(Config.aload(str(self.path / 'exp_1.json')))
+
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_reload(self):
+        c = Config(str(self.path / 'exp_1.json'), cache=True)
+        self.assertListEqual([], c.reload())
+
+        b, m, b_raw = c.b, c.m, c.__dict__['b']
+        self.write('modules/module.json', {'ma': 1, 'mb': [1, 2, 3], 'mc': 1})
+        self.write('base.json', {'a': 5, 'b': {'ba': [1, 2, 3]}, 'c': 1})
+
+        self.assertListEqual(['c', 'm.mb', 'm.mc'], sorted(c.reload()))
+        self.assertDictEqual({'a': 2, 'b': {'ba': [1, 2, 3]}, 'c': 1, 'm': {'ma': 1, 'mb': [1, 2, 3], 'mc': 1}},
+                             c.__dict__)
+        self.assertIs(b, c.b)
+        self.assertIs(b_raw, c.__dict__['b'])
+        self.assertIsNot(m, c.m)
+
+        self.write('exp_1.json', {PARENT_CONFIG_TAG: 'base.json'})
+        self.assertListEqual(['m', 'a'], c.reload())
+        self.assertDictEqual({'a': 5, 'b': {'ba': [1, 2, 3]}, 'c': 1}, c.__dict__)
+
+    def test_overrides_sources(self):
+        self.write('overrides.json', {'a': 10, 'b.ba.0': 10, 'm.ma': 10, 'x': 10})
+        environ = {'CFG__b__ba__1': '20', 'CFG__m__ma': "'env'", 'CFG__x': '[1, 2]', 'OTHER': '1'}
+        sys.argv += ['--m.ma', 'cli', '--x.0', '30']
+        try:
+            with patch.dict('os.environ', environ):
+                c = Config(str(self.path / 'exp_1.json'), overrides={'x.1': 40},
+                           overrides_file=str(self.path / 'overrides.json'))
+        finally:
+            sys.argv = sys.argv[:1]
+
+        self.assertDictEqual({'a': 10, 'b': {'ba': [10, 20, 3]}, 'm': {'ma': 'cli', 'mb': [1, 2]}, 'x': [30, 40]},
+                             c.__dict__)
+
+    def test_overrides_file_environment(self):
+        self.write('overrides.json', {'m.mb.1': 5})
+        with patch.dict('os.environ', {ENV_OVERRIDES_NAME: str(self.path / 'overrides.json')}):
+            c = Config(str(self.path / 'exp_1.json'))
+            c2 = Config(str(self.path / 'exp_1.json'), cli=False)
+
+        self.assertListEqual([1, 5], c.m['mb'])
+        self.assertListEqual([1, 2], c2.m['mb'])
+
+    def test_overrides_precedence(self):
+        self.write('overrides.json', {'m': {'mc': 1}, 'b.bb': 1})
+        with patch.dict('os.environ', {'CFG__m__ma': '2', 'CFG__b': 'None'}):
+            c = Config(str(self.path / 'exp_1.json'), overrides_file=str(self.path / 'overrides.json'),
+                       overrides={'b': {'bc': 3}})
+
+        self.assertDictEqual({'mc': 1, 'ma': 2}, c.m)
+        self.assertDictEqual({'bc': 3}, c.b)
+
+    def test_overrides_file_invalid(self):
+        self.write('overrides.json', [1, 2])
+        with self.assertRaises(ValueError):
+            Config(str(self.path / 'exp_1.json'), overrides_file=str(self.path / 'overrides.json'))
+
+    def test_sweep_ignores_commandline(self):
+        sys.argv += ['--a', '100', 'unrelated']
+        try:
+            with patch.dict('os.environ', {'CFG__b': '1'}):
+                variants = list(Config.sweep(str(self.path / 'exp_1.json'), {'m.ma': [1, 2]}))
+                lazy = next(Config.sweep(str(self.path / 'exp_1.json'), {'m.ma': [3]}, lazy=True, cli=True))
+        finally:
+            sys.argv = sys.argv[:1]
+
+        self.assertListEqual([(2, 1), (2, 2)], [(v.a, v.m['ma']) for v in variants])
+        self.assertTrue(all(v.b == {'ba': [1, 2, 3]} for v in variants))
+        self.assertEqual((100, 1, 3), (lazy.a, lazy.b, lazy.m['ma']))
+
+    def test_reload_keeps_overrides(self):
+        c = Config(str(self.path / 'exp_1.json'), overrides={'m.ma': 7})
+        self.write('modules/module.json', {'ma': 1, 'mb': [1, 2, 3]})
+
+        self.assertListEqual(['m.mb'], c.reload())
+        self.assertDictEqual({'ma': 7, 'mb': [1, 2, 3]}, c.m)
+
+    def test_watch(self):
+        c = Config(str(self.path / 'exp_1.json'))
+        changes = []
+        event = threading.Event()
+
+        def callback(config, changed):
+            changes.append((config, changed))
+            event.set()
+
+        c.watch(callback, interval=0.01)
+        self.addCleanup(c.unwatch)
+
+        # a different size, so the change is detected also with coarse modification times
+        self.write('modules/module.json', {'ma': 20, 'mb': [1, 2]})
+        self.assertTrue(event.wait(5))
+        self.assertListEqual([(c, ['m.ma'])], changes)
+        self.assertEqual(20, c.m['ma'])
+
+        c.unwatch()
+        self.assertIsNone(c._watcher)
+
+    def test_profile_disabled(self):
+        with patch.dict('os.environ', {ENV_PROFILE_NAME: '0'}):
+            c = Config(str(self.path / 'exp_1.json'))
+
+        self.assertIsNone(c.load_stats())
+
+    def test_profile_disabled_nested(self):
+        stats = LoadStats()
+        with recording(stats):
+            c = Config(str(self.path / 'exp_1.json'), profile=False)
+
+        self.assertIsNone(c.load_stats())
+        self.assertListEqual([], stats.events)
+
+    def test_profile(self):
+        clear_import_cache()
+        self.write('objects.json', {PARENT_CONFIG_TAG: 'exp_1.json', 'cls': f'{IMPORT_TAG}tests._utils.Dummy',
+                                    'obj': {CLASS_TAG: 'tests._utils.Dummy', OBJECT_PARM_TAG: {'x': 1}}})
+        c = Config(str(self.path / 'objects.json'), profile=True)
+        c.get('obj')
+
+        stages = c.load_stats().stages()
+        for stage in ('read', 'parse', 'load', 'parent', 'include', 'import', 'instantiate'):
+            self.assertIn(stage, stages)
+        self.assertEqual(4, stages['parse']['count'])
+        self.assertEqual(1, stages['instantiate']['count'])
+
+        names = c.load_stats().names()
+        self.assertIn('read', names[str(self.path / 'base.json')])
+        self.assertIn('include', names[str(self.path / 'modules/module.json')])
+        self.assertEqual(1, names['Dummy']['instantiate']['count'])
+
+    def test_profile_cached_imports(self):
+        self.write('imports.json', {'cls': f'{IMPORT_TAG}tests._utils.Dummy'})
+        Config(str(self.path / 'imports.json'))
+        c = Config(str(self.path / 'imports.json'), profile=True)
+
+        self.assertEqual(1, c.load_stats().names('import')['tests._utils.Dummy']['import']['count'])
+
+    def test_profile_environment(self):
+        with patch.dict('os.environ', {ENV_PROFILE_NAME: '1'}):
+            c = Config(str(self.path / 'exp_1.json'))
+        c2 = Config(str(self.path / 'exp_2.json'))
+
+        self.assertEqual(1, c.load_stats().stages()['include']['count'])
+        self.assertIsNone(c2.load_stats())
+
+    def test_profile_threads(self):
+        self.write('parallel.json', {'objs': [{CLASS_TAG: 'tests._utils.Dummy'} for _ in range(4)]})
+        c = Config(str(self.path / 'exp_1.json'), profile=True, prefetch=True)
+        c2 = Config(str(self.path / 'parallel.json'), profile=True)
+        c2.get('objs', parallel=2)
+
+        self.assertEqual(3, c.load_stats().stages()['parse']['count'])
+        self.assertEqual(4, c2.load_stats().stages()['instantiate']['count'])
+
+    def test_profile_export(self):
+        c = Config(str(self.path / 'exp_1.json'), profile=True)
+        c.load_stats().save(str(self.path / 'stats.json'))
+        c.load_stats().save(str(self.path / 'trace.json'), format='chrome')
+
+        with open(self.path / 'stats.json') as file:
+            report = json.load(file)
+        with open(self.path / 'trace.json') as file:
+            trace = json.load(file)
+
+        self.assertSetEqual({'stages', 'names', 'events'}, set(report))
+        self.assertEqual(len(report['events']), len(trace['traceEvents']))
+        self.assertTrue(all(event['ph'] == 'X' and event['dur'] >= 0 for event in trace['traceEvents']))
+        with self.assertRaises(ValueError):
+            c.load_stats().save(str(self.path / 'stats.txt'), format='txt')
+
+    def test_save(self):
+        self.write('imports.json', {PARENT_CONFIG_TAG: 'exp_1.json', 'cls': f'{IMPORT_TAG}tests._utils.Dummy',
+                                    'fnc': [f'{IMPORT_TAG}os.path.join', (1, 2)], 'mod': f'{IMPORT_TAG}json'})
+        for lazy in (False, True):
+            for ext in ('.json', '.yaml'):
+                with self.subTest(lazy=lazy, ext=ext):
+                    c = Config(str(self.path / 'imports.json'), lazy=lazy)
+                    c.save_to(str(self.path / f'saved{ext}'))
+
+                    saved = Config(str(self.path / f'saved{ext}'))
+                    self.assertDictEqual(c.__dict__, saved.__dict__)
+                    self.assertIs(Dummy, saved.cls)
+
+        with open(self.path / 'saved.json') as file:
+            raw = json.load(file)
+        self.assertDictEqual({'cls': f'{IMPORT_TAG}tests._utils.Dummy', 'mod': f'{IMPORT_TAG}json',
+                              'fnc': [f'{IMPORT_TAG}os.path.join', [1, 2]]},
+                             {key: raw[key] for key in ('cls', 'mod', 'fnc')})
+
+        c = Config(str(self.path / 'exp_1.json')).with_overrides({'m.ma': Dummy()})
+        with self.assertRaises(TypeError):
+            c.save_to(str(self.path / 'saved.json'))
+
+    def test_save_special_numbers(self):
+        c = Config(str(self.path / 'exp_1.json'), overrides={'f': [float('nan'), float('inf'), -float('inf')],
+                                                              'i': 2 ** 70})
+        c.save_to(str(self.path / 'saved.json'))
+        saved = Config(str(self.path / 'saved.json'))
+
+        self.assertTrue(math.isnan(saved.f[0]))
+        self.assertListEqual([float('inf'), -float('inf')], saved.f[1:])
+        self.assertEqual(2 ** 70, saved.i)
+
+    def test_save_delta(self):
+        c = Config(str(self.path / 'exp_1.json'), overrides={'m.ma': 5, 'x': f'{IMPORT_TAG}tests._utils.Dummy'})
+        self.path.joinpath('runs').mkdir()
+        c.save_to(str(self.path / 'runs' / 'run.json'), delta=True)
+
+        with open(self.path / 'runs' / 'run.json') as file:
+            saved = json.load(file)
+        self.assertDictEqual({PARENT_CONFIG_TAG: '../exp_1.json', 'm': {'ma': 5, 'mb': [1, 2]},
+                              'x': f'{IMPORT_TAG}tests._utils.Dummy'}, saved)
+        self.assertDictEqual(c.__dict__, Config(str(self.path / 'runs' / 'run.json')).__dict__)
+
+    def write_model(self):
+        return self.write('model.json', {PARENT_CONFIG_TAG: 'exp_1.json', 'fnc': f'{IMPORT_TAG}os.path.join',
+                                          'model': {CLASS_TAG: 'tests._utils.Dummy', OBJECT_PARM_TAG: {'lr': 0.1}}})
+
+    def test_fingerprint(self):
+        c = Config(str(self.write_model()))
+        lazy = Config(str(self.path / 'model.json'), lazy=True)
+
+        self.assertEqual(64, len(c.fingerprint()))
+        self.assertEqual(c.fingerprint(), lazy.fingerprint())
+        self.assertEqual(c.fingerprint('m'), lazy.fingerprint('m'))
+        self.assertEqual(c.fingerprint('m'), c.with_overrides({'m': {'mb': (1, 2), 'ma': 1}}).fingerprint('m'))
+        self.assertEqual(c.fingerprint('m.ma'), c.with_overrides({'a': 1}).fingerprint('a'))
+        self.assertEqual(c.fingerprint('model'),
+                         c.with_overrides({'model.class': Dummy}).fingerprint('model'))
+        self.assertRaises(KeyError, c.fingerprint, 'm.x')
+        self.assertRaises(KeyError, c.fingerprint, 'x')
+
+        # imported objects are hashed by the name in the config, not by their module
+        imported = self.write('imported.json', {'model': {CLASS_TAG: f'{IMPORT_TAG}json.JSONDecoder'}})
+        named = self.write('named.json', {'model': {CLASS_TAG: 'json.JSONDecoder'}})
+        self.assertEqual(Config(str(named)).fingerprint(), Config(str(imported)).fingerprint())
+
+        # saved configs have the same values
+        c.save_to(str(self.path / 'saved.yaml'))
+        self.assertEqual(c.fingerprint(), Config(str(self.path / 'saved.yaml')).fingerprint())
+
+    def test_fingerprint_overrides(self):
+        c = Config(str(self.write_model()))
+        variant = c.with_overrides({'model.params.lr': 0.2})
+
+        self.assertNotEqual(c.fingerprint(), variant.fingerprint())
+        self.assertNotEqual(c.fingerprint('model'), variant.fingerprint('model'))
+        self.assertEqual(c.fingerprint('m'), variant.fingerprint('m'))
+        self.assertEqual(c.fingerprint(), variant.with_overrides({'model.params.lr': 0.1}).fingerprint())
+
+        with patch.object(_fingerprint._Hasher, 'hash_container', autospec=True,
+                          side_effect=_fingerprint._Hasher.hash_container) as hash_container:
+            variant = c.with_overrides({'model.params.lr': 0.3})
+            # the hashes of the config are used, not copied
+            self.assertDictEqual({}, variant._hashes.maps[0])
+            variant.fingerprint()
+
+        # the toplevel values, 'model' and 'model.params' are hashed again
+        self.assertEqual(3, hash_container.call_count)
+
+        c.a = 5
+        self.assertEqual(c.fingerprint(), c.with_overrides({}).fingerprint())
+        self.assertNotEqual(c.fingerprint(), Config(str(self.path / 'model.json')).fingerprint())
+
+    def test_clear_fingerprint_cache(self):
+        c = Config(str(self.write_model()))
+        expected = c.fingerprint()
+
+        with patch.object(_fingerprint._Hasher, 'hash_container', autospec=True,
+                          side_effect=_fingerprint._Hasher.hash_container) as hash_container:
+            self.assertEqual(expected, c.with_overrides({}).fingerprint())
+            self.assertEqual(1, hash_container.call_count)
+
+            clear_fingerprint_cache()
+            self.assertEqual(expected, c.fingerprint())
+        # all containers are hashed again: toplevel, 'b', 'b.ba', 'm', 'm.mb', 'model', 'model.params'
+        self.assertEqual(8, hash_container.call_count)
+
+    def test_method_names_as_keys(self):
+        values = {'validate': True, 'reload': 1, 'get': 2, 'clear_cache': 3, 'with_overrides': 4, 'fingerprint': 'abc'}
+        path = self.write('names.json', {PARENT_CONFIG_TAG: 'exp_1.json', **values})
+        schema = {'a': int, 'b': dict, 'm': dict, **{name: type(value) for name, value in values.items()}}
+        c = Config(str(path), schema=schema, overrides={'reload': 5})
+
+        self.assertTrue(c.validate)
+        self.assertEqual(2, c['get'])
+        self.assertEqual(2, c.a)
+
+        self.write('modules/module.json', {'ma': 20, 'mb': [1, 2]})
+        self.assertListEqual(['m.ma'], Config.reload(c))
+        variants = list(Config.sweep(c, {'reload': [6, 7]}))
+        self.assertListEqual([6, 7], [variant.reload for variant in variants])
+        self.assertEqual(Config.fingerprint(c), Config.fingerprint(Config.with_overrides(c, {})))
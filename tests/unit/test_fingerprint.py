@@ -0,0 +1,78 @@
+"""test_fingerprint.py: Tests for the content hashes of config values.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Tests for the content hashes of config values, see test_files.py for
+```Config.fingerprint```.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from config import _fingerprint
+from config._fingerprint import fingerprint
+from tests._utils import Dummy
+
+
+def name_of(value):
+    return f'{value.__module__}.{value.__qualname__}' if isinstance(value, type) else None
+
+
+class TestFingerprint(TestCase):
+
+    def test_canonical(self):
+        value = {'a': 1, 'b': [1.5, 'x', None, True], 'c': {'ca': (1, 2)}}
+
+        self.assertEqual(64, len(fingerprint(value, name_of, {})))
+        self.assertEqual(fingerprint(value, name_of, {}),
+                         fingerprint({'c': {'ca': [1, 2]}, 'b': [1.5, 'x', None, True], 'a': 1}, name_of, {}))
+        self.assertEqual(fingerprint({'class': 'tests._utils.Dummy'}, name_of, {}),
+                         fingerprint({'class': Dummy}, name_of, {}))
+
+    def test_distinct(self):
+        values = [None, True, 1, 1.0, '1', 'tests._utils.Dummy', Dummy, [], {}, [1], [[1]], {'1': 1}, {1: 1},
+                  {'a': 'b'}, {'ab': ''}, ['a', 'b'], ['ab'], [None, None], [None]]
+        hashes = [fingerprint(value, name_of, {}) for value in values]
+
+        self.assertEqual(len(values), len(set(hashes)))
+
+    def test_unhashable(self):
+        with self.assertRaises(TypeError):
+            fingerprint({'a': [Dummy()]}, name_of, {})
+
+    def test_memoize(self):
+        shared = {'x': list(range(10))}
+        value = {'a': shared, 'b': {'ba': 1}}
+        cache = {}
+        expected = fingerprint(value, name_of, cache)
+
+        with patch.object(_fingerprint._Hasher, 'hash_container', autospec=True,
+                          side_effect=_fingerprint._Hasher.hash_container) as hash_container:
+            self.assertEqual(expected, fingerprint(value, name_of, cache))
+            self.assertEqual(0, hash_container.call_count)
+
+            fingerprint({'a': shared, 'b': {'ba': 2}}, name_of, cache)
+            self.assertEqual(2, hash_container.call_count)
+
+    def test_previous(self):
+        shared = {'x': list(range(10))}
+        previous = {}
+        fingerprint({'a': shared, 'b': {'ba': 1}}, name_of, previous)
+        cache = {}
+
+        with patch.object(_fingerprint._Hasher, 'hash_container', autospec=True,
+                          side_effect=_fingerprint._Hasher.hash_container) as hash_container:
+            fingerprint({'a': shared}, name_of, cache, [previous], memoize=False)
+            self.assertEqual(1, hash_container.call_count)
+
+        # only the containers of the hashed value are kept
+        self.assertEqual({id(shared), id(shared['x'])}, set(cache))
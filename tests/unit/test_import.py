@@ -0,0 +1,77 @@
+"""test_import.py: Tests for the startup cost of the config tool.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Tests that importing the config package and loading a small config stay
+within a time budget and do not import heavy modules that are not needed.
+Every test runs a new Python process, so modules imported by other tests
+do not interfere.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+import sys
+import json
+import tempfile
+import subprocess
+from pathlib import Path
+
+from unittest import TestCase, skipIf
+
+
+ROOT = Path(__file__).parents[2]
+
+# Budgets in seconds, generous enough for slow CI machines
+IMPORT_BUDGET = 0.25
+LOAD_BUDGET = 0.25
+
+DEFERRED_MODULES = ('argparse', 'asyncio', 'concurrent.futures', 'pickle', 'hashlib', 'mmap')
+
+
+def run_python(*args, code):
+    """Runs 'code' in a new Python process and returns stdout and stderr."""
+    result = subprocess.run([sys.executable, *args, '-c', code], cwd=str(ROOT), check=True,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    return result.stdout, result.stderr
+
+
+class TestImport(TestCase):
+
+    @skipIf(sys.version_info < (3, 7), "'-X importtime' is new in Python 3.7")
+    def test_import_time(self):
+        _, stderr = run_python('-X', 'importtime', code='import config')
+
+        # lines have the format 'import time: <self us> | <cumulative us> | <module>'
+        times = {line.rsplit('|', 1)[-1].strip(): int(line.split('|')[1])
+                 for line in stderr.splitlines() if line.startswith('import time:') and 'cumulative' not in line}
+        self.assertLess(times['config'] / 1e6, IMPORT_BUDGET)
+
+    def test_deferred_imports(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, 'config.json')
+            with open(path, 'w') as file:
+                json.dump({'a': 1, 'b': {'ba': [1, 2]}}, file)
+
+            stdout, _ = run_python(code=f"""if True:
+                import sys, time, json
+                import config
+                imported = [name for name in {DEFERRED_MODULES!r} if name in sys.modules]
+
+                start = time.perf_counter()
+                config.Config({str(path)!r}, cli=False)
+                load_time = time.perf_counter() - start
+                loaded = [name for name in {DEFERRED_MODULES!r} if name in sys.modules]
+                print(json.dumps({{'imported': imported, 'loaded': loaded, 'load_time': load_time}}))
+            """)
+
+        result = json.loads(stdout)
+        self.assertListEqual([], result['imported'])
+        self.assertListEqual([], result['loaded'])
+        self.assertLess(result['load_time'], LOAD_BUDGET)
@@ -0,0 +1,115 @@
+"""test_parallel.py: Tests for the parallel instantiation of objects.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Tests for the parallel instantiation of objects.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+import time
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from config import InstantiationError
+from config.constants import CLASS_TAG, OBJECT_PARM_TAG
+from config._utils import load_objects
+from config._parallel import load_objects_parallel
+from config._profile import LoadStats, recording
+from tests._utils import Dummy, Slow
+
+
+def _obj(cls, params=None):
+    spec = {CLASS_TAG: f'tests._utils.{cls}'}
+    if params is not None:
+        spec[OBJECT_PARM_TAG] = params
+    return spec
+
+
+SAMPLE = {
+    'loaders': [_obj('Slow', {'a': i}) for i in range(4)],
+    'model': _obj('Dummy', {'encoder': _obj('Slow', {'b': 1}),
+                            'layers': [_obj('Slow', [i]) for i in range(2)]}),
+    'value': 1,
+}
+
+
+class TestParallel(TestCase):
+
+    def assertObjectsEqual(self, expected, actual):
+        if isinstance(expected, Dummy):
+            self.assertIs(type(expected), type(actual))
+            self.assertObjectsEqual(expected.args, actual.args)
+            self.assertObjectsEqual(expected.kwargs, actual.kwargs)
+        elif isinstance(expected, (list, tuple)):
+            self.assertEqual(len(expected), len(actual))
+            for exp, act in zip(expected, actual):
+                self.assertObjectsEqual(exp, act)
+        elif isinstance(expected, dict):
+            self.assertSetEqual(set(expected), set(actual))
+            for key in expected:
+                self.assertObjectsEqual(expected[key], actual[key])
+        else:
+            self.assertEqual(expected, actual)
+
+    def test_same_result(self):
+        expected = load_objects(SAMPLE, 0, c=2)
+        actual = load_objects_parallel(SAMPLE, (0, ), {'c': 2})
+        self.assertObjectsEqual(expected, actual)
+
+    def test_parallel(self):
+        start = time.perf_counter()
+        result = load_objects_parallel(SAMPLE, parallel=8)
+        duration = time.perf_counter() - start
+
+        # 7 slow objects, at most 2 of them depend on each other
+        self.assertLess(duration, 0.5)
+        self.assertIsInstance(result['model'].kwargs['encoder'], Slow)
+
+    def test_critical_path(self):
+        sample = {'a': _obj('Slow', {'delay': 0.4}),
+                  'b': _obj('Slow', {'delay': 0.3, 'child': _obj('Slow', {'delay': 0.1})})}
+
+        start = time.perf_counter()
+        result = load_objects_parallel(sample, parallel=4)
+        duration = time.perf_counter() - start
+
+        # 'b' does not wait for the unrelated 'a', i.e. 0.4s instead of 0.7s
+        self.assertLess(duration, 0.6)
+        self.assertIsInstance(result['b'].kwargs['child'], Slow)
+
+    def test_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = load_objects_parallel(SAMPLE, parallel=executor)
+
+        self.assertEqual(3, result['loaders'][3].kwargs['a'])
+
+    def test_process_pool_profiled(self):
+        stats = LoadStats()
+        with ProcessPoolExecutor(max_workers=2) as executor, recording(stats):
+            result = load_objects_parallel({'a': _obj('Dummy', {'b': _obj('Dummy', [1])})}, parallel=executor)
+
+        self.assertListEqual([1], list(result['a'].kwargs['b'].args))
+
+        stats = LoadStats()
+        with recording(stats):
+            load_objects_parallel({'a': _obj('Dummy', {'b': _obj('Dummy', [1])})}, parallel=2)
+        self.assertEqual(2, stats.stages()['instantiate']['count'])
+
+    def test_errors(self):
+        sample = {'a': _obj('Failing'),
+                  'b': [_obj('Dummy'), _obj('Dummy', [_obj('Failing')])],
+                  'c': _obj('Dummy', {'d': _obj('Dummy', [_obj('Failing')])})}
+
+        with self.assertRaises(InstantiationError) as context:
+            load_objects_parallel(sample, path='x')
+
+        self.assertSetEqual({'x.a', 'x.b.1.params.0', 'x.c.params.d.params.0'}, set(context.exception.errors))
+        self.assertTrue(all(isinstance(ex, ValueError) for ex in context.exception.errors.values()))
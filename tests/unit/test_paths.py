@@ -0,0 +1,142 @@
+"""test_paths.py: Tests for the compiled dotted paths of the config tool.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Tests for the compiled dotted paths of the config tool.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+import copy
+import random
+
+from unittest import TestCase
+
+from config._paths import KeyPath, compile_path, build_index
+from config._utils import get_key, try_to_number
+
+
+class TestKeyPath(TestCase):
+
+    def test_compile(self):
+        path = compile_path('model.layers.3.units')
+
+        self.assertTupleEqual(('model', 'layers', '3', 'units'), path.keys)
+        self.assertTupleEqual((None, None, 3, None), path.indices)
+        self.assertIs(path, compile_path('model.layers.3.units'))
+        self.assertIs(path, compile_path(path))
+        self.assertEqual(path, KeyPath(['model', 'layers', 3, 'units']))
+
+    def test_lookup(self):
+        tree = {'a': {'aa': [1, {'x': 2}]}, '0': 'key'}
+
+        self.assertEqual(2, compile_path('a.aa.1.x').lookup(tree))
+        self.assertEqual('key', compile_path('0').lookup(tree))
+        self.assertIsNone(compile_path('a.aa.2').lookup(tree))
+        self.assertEqual(-1, compile_path('a.ab').lookup(tree, default=-1))
+        self.assertEqual(2, compile_path('cfg.a.aa.1.x').lookup(tree, start=1))
+
+    def test_build_index(self):
+        index = build_index('m', {'a': [1, {'x': 2}]})
+
+        self.assertDictEqual({'m': {'a': [1, {'x': 2}]}, 'm.a': [1, {'x': 2}], 'm.a.0': 1,
+                              'm.a.1': {'x': 2}, 'm.a.1.x': 2}, index)
+
+
+def set_sequential(tree, overrides):
+    """Sets the values of nested paths one after another like the original override
+    loop of 'Config', which modifies 'tree' in place."""
+    for name, value in overrides:
+        names = name.split('.')
+        current = tree
+        for i, cur_key in enumerate(names):
+            last = i == len(names) - 1
+            idx = get_key(current, cur_key)
+            if idx is None and not last:
+                new_current = [] if isinstance(try_to_number(names[i + 1]), int) else {}
+                if isinstance(current, dict):
+                    current[cur_key] = new_current
+                else:
+                    current.append(new_current)
+                current = new_current
+            elif not last:
+                current = current[idx]
+            else:
+                # the original loop converted existing string keys like '0' of dictionaries to int
+                current[idx if isinstance(current, dict) and idx is not None else try_to_number(cur_key)] = value
+    return tree
+
+
+class TestReplace(TestCase):
+
+    def replace_all(self, tree, overrides):
+        owned = {}
+        for path, value in overrides:
+            tree = compile_path(path).replace(tree, value, owned=owned)
+        return tree
+
+    def test_same_as_sequential(self):
+        tree = {'a': {'aa': [1, 2, 3], 'ab': {'x': 1}}, 'b': [{'ba': 1}], 'c': 1}
+        cases = [
+            [('a.aa.0', 5), ('a.ab.x', 6), ('a.ab.y', 7)],
+            [('a.ab.x', 6), ('a.ab', {'z': 1})],
+            [('a.ab', {'z': 1}), ('a.ab.x', 6)],
+            [('b.1.bb', 1), ('b.2.bc', 2), ('b.0.ba', 3)],
+            [('b.3.x', 1), ('b.1.y', 2), ('b.3.z', 3)],
+            [('b.1.0.a', [7]), ('b.1', 5)],
+        ]
+        for overrides in cases:
+            with self.subTest(overrides=overrides):
+                expected = set_sequential(copy.deepcopy(tree), copy.deepcopy(overrides))
+                self.assertEqual(expected, self.replace_all(tree, overrides))
+
+        self.assertDictEqual({'a': {'aa': [1, 2, 3], 'ab': {'x': 1}}, 'b': [{'ba': 1}], 'c': 1}, tree)
+
+    def test_same_as_sequential_random(self):
+        rng = random.Random(0)
+        keys = ['a', 'b', '0', '1', '2']
+        values = [None, 5, [7], {'x': 1}, [None]]
+
+        def path():
+            return '.'.join(rng.choice(keys) for _ in range(rng.randint(2, 4)))
+
+        compared = 0
+        for _ in range(5000):
+            tree = {'a': [None], 'b': {'0': [1, {'x': 2}]}}
+            overrides = [(path(), copy.deepcopy(rng.choice(values))) for _ in range(rng.randint(1, 4))]
+            try:
+                expected = set_sequential(copy.deepcopy(tree), copy.deepcopy(overrides))
+            except (IndexError, TypeError, AttributeError, AssertionError):
+                # invalid for the original loop, e.g. an index past the end of a list
+                continue
+
+            compared += 1
+            original = copy.deepcopy(tree)
+            self.assertEqual(expected, self.replace_all(tree, overrides), overrides)
+            self.assertEqual(original, tree)
+        self.assertGreater(compared, 500)
+
+    def test_create_missing(self):
+        tree = {'b': [{'ba': 1}]}
+        new = self.replace_all(tree, [('f.0.fa.0.faa', 5), ('b.1.bb', 6)])
+
+        self.assertDictEqual({'f': [{'fa': [{'faa': 5}]}], 'b': [{'ba': 1}, {'bb': 6}]}, new)
+        self.assertDictEqual({'b': [{'ba': 1}]}, tree)
+
+    def test_shared(self):
+        tree = {'a': {'aa': [1, 2, 3], 'ab': {'x': 1}}, 'b': [{'ba': 1}]}
+        value = {'z': 1}
+        new = self.replace_all(tree, [('a.aa.1', 5), ('a.aa.2', 6), ('a.ac', value), ('a.ac.y', 2)])
+
+        self.assertListEqual([1, 5, 6], new['a']['aa'])
+        self.assertIs(tree['a']['ab'], new['a']['ab'])
+        self.assertIs(tree['b'], new['b'])
+        self.assertDictEqual({'z': 1, 'y': 2}, new['a']['ac'])
+        self.assertDictEqual({'z': 1}, value)
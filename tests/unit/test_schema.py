@@ -0,0 +1,136 @@
+"""test_schema.py: Tests for the schema validation of the config tool.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Tests for the schema validation and type coercion of config values.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, field
+
+from unittest import TestCase
+
+from config import compile_schema
+from config.constants import CLASS_TAG, OBJECT_PARM_TAG
+
+
+class Layer:
+    def __init__(self, units: int, activation: str = 'relu'):
+        self.units = units
+        self.activation = activation
+
+
+@dataclass
+class Optimizer:
+    lr: float
+    momentum: float = 0.9
+    betas: List[float] = field(default_factory=list)
+
+
+def validate(schema, value, **kwargs):
+    errors = {}
+    result = compile_schema(schema, **kwargs)(value, '', errors)
+    return result, errors
+
+
+class TestSchema(TestCase):
+
+    def test_types(self):
+        self.assertEqual((1, {}), validate(int, 1))
+        self.assertEqual((1.0, {}), validate(float, 1))
+        self.assertEqual((0.001, {}), validate(float, '1e-3'))
+        self.assertEqual((True, {}), validate(bool, 'true'))
+        self.assertEqual(({'': 'expected int, got bool'}), validate(int, True)[1])
+        self.assertEqual(({'': 'expected str, got int'}), validate(str, 1)[1])
+        self.assertEqual(({'': 'expected float, got str'}), validate(float, '1e-3', coerce=False)[1])
+
+    def test_typing(self):
+        self.assertEqual(([1, 2], {}), validate(List[int], [1, '2']))
+        self.assertEqual(({'a': 1.0}, {}), validate(Dict[str, float], {'a': 1}))
+        self.assertEqual((None, {}), validate(Optional[int], None))
+        self.assertEqual(('a', {}), validate(Union[int, str], 'a'))
+        self.assertEqual(([1, 'a'], {}), validate(Tuple[int, str], [1, 'a']))
+        self.assertEqual({'': 'expected 2 items, got 1'}, validate(Tuple[int, str], [1])[1])
+        self.assertEqual({'1': 'expected int, got str'}, validate(List[int], [1, 'x'])[1])
+
+    def test_mapping(self):
+        schema = {'model': {'lr': float, 'layers': [int], 'name': Optional[str]}}
+        value = {'model': {'lr': 1, 'layers': [1, 2], 'unit': 3}}
+        result, errors = validate(schema, value)
+
+        self.assertDictEqual({'model.unit': 'unknown key'}, errors)
+        self.assertEqual(1.0, result['model']['lr'])
+        self.assertIsInstance(result['model']['lr'], float)
+        self.assertEqual(1, value['model']['lr'])
+        self.assertIs(value['model']['layers'], result['model']['layers'])
+
+        _, errors = validate(schema, {'model': {'layers': [1, 'x']}})
+        self.assertDictEqual({'model.lr': 'missing required value', 'model.layers.1': 'expected int, got str'},
+                             errors)
+
+    def test_dataclass(self):
+        result, errors = validate({'opt': Optimizer}, {'opt': {'lr': '0.1', 'betas': [1, 0.9]}})
+
+        self.assertDictEqual({}, errors)
+        self.assertDictEqual({'opt': {'lr': 0.1, 'betas': [1.0, 0.9]}}, result)
+
+        _, errors = validate({'opt': Optimizer}, {'opt': {'momentun': 0.1}})
+        self.assertDictEqual({'opt.lr': 'missing required value', 'opt.momentun': 'unknown key'}, errors)
+
+    def test_json_schema(self):
+        schema = {'type': 'object', 'required': ['lr'], 'additionalProperties': False,
+                  'properties': {'lr': {'type': 'number', 'exclusiveMinimum': 0},
+                                 'act': {'enum': ['relu', 'tanh']},
+                                 'layers': {'type': 'array', 'items': {'type': 'integer'}, 'minItems': 1}}}
+
+        self.assertEqual(({'lr': 0.1, 'layers': [1]}, {}), validate(schema, {'lr': 0.1, 'layers': [1.0]}))
+        _, errors = validate(schema, {'lr': 0, 'act': 'elu', 'layers': [], 'x': 1})
+        self.assertDictEqual({'lr': 'exclusiveMinimum is 0, got 0',
+                              'act': "expected one of ['relu', 'tanh'], got 'elu'",
+                              'layers': 'minItems is 1, got 0', 'x': 'unknown key'}, errors)
+
+    def test_json_keyword_keys(self):
+        self.assertDictEqual({'name': 'expected str, got int'}, validate({'items': [int], 'name': str},
+                                                                         {'items': [1], 'name': 5})[1])
+        self.assertDictEqual({'items.0': 'expected int, got str'}, validate({'items': [int]}, {'items': ['a']})[1])
+        self.assertEqual(({'enum': 'a', 'x': 1}, {}), validate({'enum': str, 'x': int}, {'enum': 'a', 'x': '1'}))
+        self.assertEqual(({'type': ['a']}, {}), validate({'type': [str]}, {'type': ['a']}))
+        self.assertDictEqual({'type.0': 'expected str, got int'}, validate({'type': [str]}, {'type': [1]})[1])
+        self.assertDictEqual({'properties.a': 'expected int, got str'},
+                             validate({'properties': {'a': int}}, {'properties': {'a': 'x'}})[1])
+
+        # JSON Schemas with the same keywords
+        self.assertDictEqual({'': 'expected list, got str'}, validate({'type': 'array', 'items': {}}, 'a')[1])
+        self.assertDictEqual({}, validate({'$schema': 'http://json-schema.org/draft-07/schema#'}, 1)[1])
+
+    def test_params(self):
+        layer = {CLASS_TAG: 'tests.unit.test_schema.Layer', OBJECT_PARM_TAG: {'units': '64'}}
+        result, errors = validate(None, {'layers': [layer]})
+        self.assertDictEqual({}, errors)
+        self.assertEqual(64, result['layers'][0][OBJECT_PARM_TAG]['units'])
+        self.assertEqual('64', layer[OBJECT_PARM_TAG]['units'])
+
+        _, errors = validate(None, {'layers': [{CLASS_TAG: 'tests.unit.test_schema.Layer',
+                                                OBJECT_PARM_TAG: {'units': 1, 'unit': 2}},
+                                               {CLASS_TAG: 'tests.unit.test_schema.Missing'}]})
+        self.assertSetEqual({'layers.0.params', 'layers.1.class'}, set(errors))
+        self.assertIn("unexpected keyword argument 'unit'", errors['layers.0.params'])
+
+        _, errors = validate({'layer': Layer}, {'layer': {CLASS_TAG: 'tests._utils.Dummy'}})
+        self.assertDictEqual({'layer': 'expected Layer, got Dummy'}, errors)
+
+    def test_cached(self):
+        schema = {'a': int}
+
+        self.assertIs(compile_schema(schema), compile_schema(schema))
+        self.assertIs(compile_schema(List[int]), compile_schema(List[int]))
+        self.assertIsNot(compile_schema(schema), compile_schema(schema, coerce=False))
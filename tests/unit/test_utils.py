@@ -0,0 +1,97 @@
+"""test_utils.py: Tests for the utility functions of the config tool.
+
+
+Author -- Christian Huber
+Created on -- 10/16/26 10:00 AM
+Contact -- christian.huber@silicon-austria.com
+
+Tests for the utility functions of the config tool.
+
+
+=======  ==========  =================  ================================
+Version  Date        Author             Description
+=======  ==========  =================  ================================
+
+"""
+
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+
+from config._utils import import_object, _import_object, clear_import_cache, parse_value
+from tests._utils import Dummy
+
+
+class TestImportObject(TestCase):
+
+    def setUp(self):
+        clear_import_cache()
+        self.addCleanup(clear_import_cache)
+
+    def test_import_class(self):
+        self.assertIs(Dummy, import_object('tests._utils.Dummy'))
+
+    def test_import_module(self):
+        import tests._utils
+        self.assertIs(tests._utils, import_object('tests._utils'))
+
+    def test_import_cached(self):
+        import_object('tests._utils.Dummy')
+        import_object('tests._utils.Dummy')
+
+        info = _import_object.cache_info()
+        self.assertEqual(1, info.misses)
+        self.assertEqual(1, info.hits)
+
+    def test_clear_cache(self):
+        import_object('tests._utils.Dummy')
+        clear_import_cache()
+        self.assertEqual(0, _import_object.cache_info().currsize)
+
+    def test_import_threaded(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            result = list(pool.map(import_object, ['tests._utils.Dummy'] * 64))
+
+        self.assertTrue(all(obj is Dummy for obj in result))
+
+
+class TestParseValue(TestCase):
+
+    def test_scalars(self):
+        self.assertIs(True, parse_value('True'))
+        self.assertIs(False, parse_value('false'))
+        self.assertIsNone(parse_value('None'))
+        self.assertIsNone(parse_value('null'))
+        self.assertIsNone(parse_value(None))
+        self.assertEqual(-12, parse_value('-12'))
+        self.assertEqual(1000, parse_value('1_000'))
+        self.assertEqual(16, parse_value('0x10'))
+        self.assertEqual(0.5, parse_value('.5'))
+        self.assertEqual(1e-3, parse_value('1e-3'))
+        self.assertEqual(float('-inf'), parse_value('-inf'))
+        self.assertTrue(parse_value('nan') != parse_value('nan'))
+
+    def test_strings(self):
+        self.assertEqual('abc', parse_value('abc'))
+        self.assertEqual('123', parse_value('"123"'))
+        self.assertEqual('a b', parse_value("'a b'"))
+        self.assertEqual('1.2.3', parse_value('1.2.3'))
+        self.assertEqual('"unterminated', parse_value('"unterminated'))
+        self.assertEqual('', parse_value(''))
+
+    def test_containers(self):
+        self.assertListEqual([1, 'a', None], parse_value("[1, 'a', None]"))
+        self.assertDictEqual({'a': [1.5, True]}, parse_value('{"a": [1.5, true]}'))
+        self.assertTupleEqual((1, 2), parse_value('(1, 2)'))
+
+    def test_single_quoted_containers(self):
+        self.assertDictEqual({'a': 1, 'b': [1, 'x']}, parse_value("{'a': 1, 'b': [1, 'x']}"))
+        self.assertDictEqual({'a': 'say "hi"'}, parse_value("""{'a': 'say "hi"'}"""))
+        self.assertDictEqual({'a': "it's"}, parse_value("""{'a': "it's"}"""))
+        self.assertDictEqual({'a': 'x\ty'}, parse_value(r"{'a': 'x\ty'}"))
+        self.assertDictEqual({'a': None, 1: (2,)}, parse_value("{'a': None, 1: (2,)}"))
+        self.assertListEqual(['a', 'b'], parse_value("['a', 'b',]"))
+
+    def test_no_code_execution(self):
+        for text in ('__import__("os").getcwd()', '2 * 3', 'len([1])', '[print(1)]', '{}.__class__'):
+            with self.subTest(text=text):
+                self.assertEqual(text, parse_value(text))